@@ -31,17 +31,264 @@ For instance, in the above example we'd see:
 melon 3
 cat 6
 cherry 8
+
+For very large files, the file can be counted in parallel with
+--workers N; it is split into chunks (--chunk-size bytes each) that are
+counted in N processes and then merged.
+
+With --top K or --bottom K only the K largest or smallest items are
+printed, and --quiet prints only the final output without STEPS 1-3.
+
+For files with more distinct words than fit in memory, --memory-limit MB
+spills partial sums to hash partitions on disk (--partitions of them),
+sums each partition on its own and merges the sorted runs for the
+output. A partition with too many words is split again first. The list
+dumps of STEPS 2 and 3 are skipped in this mode since they would need
+every item in memory.
+
+For files that only ever have lines appended, --state FILE keeps the
+sums and the position reached in a state file, so each later run only
+reads the new lines. Only complete lines are counted; a last line
+without a newline is left for the next run.
 """
+import argparse
+import concurrent.futures
+import heapq
+import io
+import itertools
+import os
+import struct
+import sys
+import tempfile
+import zlib
+
+CHUNK_SIZE=64*1024*1024  # bytes per chunk when counting in parallel
+READ_SIZE=4*1024*1024  # bytes read at a time when counting new lines
+WRITE_BATCH=10000  # output lines joined into each write
+ENTRY_SIZE=128  # rough bytes per dictionary item, for --memory-limit
+PARTITIONS=64
+STATE_MAGIC=b"COUNTS-STATE-1\n"  # first bytes of every state file
+STATE_HEADER="<QQqII"  # device, inode, offset and checks of the counted file
+CHECK_SIZE=4096  # bytes at each end of the counted part that are checked
 
-def make_dict(file):
+def make_dict(file, counts=None):
     """
     This function converts
     the file into a dictionary.
     Arguments: file is a .txt file opened 
-    in read mode.
+    in read mode. counts is a dictionary to
+    add the sums to, or None for a new one.
     Return value: counts is a dictionary 
     mapping strings to integers.
     """
+    if counts is None:
+        counts={}
+    for line in file:
+        if line.strip()!="":
+            if line[0]!="#":
+                line_list=line.split()
+                key=line_list[0]
+                value=int(line_list[1])
+                if key not in counts:
+                    counts[key]=0
+                counts[key]+=value
+    return counts
+
+def find_chunks(file, chunk_size):
+    """
+    This function splits a file into chunks of about chunk_size
+    bytes that each end at the end of a line.
+    Arguments: file is a file opened in binary mode.
+    chunk_size is a positive integer.
+    Return value: chunks is a list of (start, end)
+    tuples of byte offsets.
+    """
+    size=os.fstat(file.fileno()).st_size
+    chunks=[]
+    start=0
+    while start<size:
+        file.seek(start+chunk_size)
+        file.readline()  # move on to the end of the line
+        end=min(file.tell(), size)
+        chunks.append((start, end))
+        start=end
+    return chunks
+
+def count_chunk(filename, start, end):
+    """
+    This function converts one chunk of a file into
+    a dictionary, the same way make_dict does. It is
+    run in a worker process.
+    Arguments: filename is a string. start and end
+    are byte offsets of the chunk.
+    Return value: counts is a dictionary mapping
+    strings to integers.
+    """
+    with open(filename, "rb") as file:
+        file.seek(start)
+        data=file.read(end-start)
+    return make_dict(io.StringIO(data.decode(), newline=None))
+
+def make_dict_parallel(filename, workers, chunk_size=CHUNK_SIZE):
+    """
+    This function converts a file into a dictionary
+    by splitting it into chunks at line boundaries,
+    counting each chunk in a worker process, and
+    merging the results.
+    Arguments: filename is a string. workers is the
+    number of worker processes. chunk_size is the
+    size of each chunk in bytes.
+    Return value: counts is a dictionary mapping
+    strings to integers.
+    """
+    with open(filename, "rb") as file:
+        chunks=find_chunks(file, chunk_size)
+    counts={}
+    with concurrent.futures.ProcessPoolExecutor(workers) as pool:
+        starts=[chunk[0] for chunk in chunks]
+        ends=[chunk[1] for chunk in chunks]
+        for partial in pool.map(count_chunk, [filename]*len(chunks), starts,
+                                ends):
+            merge_counts(counts, partial)
+    return counts
+
+def merge_counts(counts, partial):
+    """
+    This function adds the sums from one dictionary
+    into another.
+    Arguments: counts and partial are dictionaries
+    mapping strings to integers. counts is changed.
+    """
+    for key, value in partial.items():
+        counts[key]=counts.get(key, 0)+value
+
+def get_checks(file, offset):
+    """
+    This function computes checksums of the start of
+    a file and of the bytes just before offset, which
+    tell whether the part already counted has changed.
+    Arguments: file is a file opened in binary mode.
+    offset is a non-negative integer.
+    Return value(s): head_check and tail_check are
+    integers.
+    """
+    file.seek(0)
+    head_check=zlib.crc32(file.read(min(offset, CHECK_SIZE)))
+    file.seek(max(0, offset-CHECK_SIZE))
+    tail_check=zlib.crc32(file.read(min(offset, CHECK_SIZE)))
+    return head_check, tail_check
+
+def save_state(state_name, source_stat, offset, checks, counts):
+    """
+    This function writes a state file. The header
+    records which file was counted and how far, and
+    the sums follow as compressed lines in the same
+    format as the input. The file is written under a
+    temporary name for this process and then renamed.
+    Arguments: state_name is a string. source_stat is
+    the os.stat result of the counted file. offset is
+    the number of bytes counted. checks is a tuple from
+    get_checks. counts is a dictionary mapping strings
+    to integers.
+    """
+    lines=["%s %d\n" % (key, value) for key, value in counts.items()]
+    temp_name="%s.%d.tmp" % (state_name, os.getpid())  # one per process
+    try:
+        with open(temp_name, "wb") as file:
+            file.write(STATE_MAGIC)
+            file.write(struct.pack(STATE_HEADER, source_stat.st_dev,
+                                   source_stat.st_ino, offset, checks[0],
+                                   checks[1]))
+            file.write(zlib.compress("".join(lines).encode()))
+        os.replace(temp_name, state_name)  # never leave half a file
+    except OSError:
+        if os.path.exists(temp_name):
+            os.remove(temp_name)
+        raise
+
+def load_state(state_name, source_stat, file):
+    """
+    This function loads the sums and offset from a
+    state file, if it was made for the same file and
+    the counted part has not changed since.
+    Arguments: state_name is a string. source_stat is
+    the os.stat result of the file being counted. file
+    is that file opened in binary mode.
+    Return value(s): counts is a dictionary mapping
+    strings to integers and offset is the number of
+    bytes already counted. Both are empty if the state
+    file is missing, out of date or damaged.
+    """
+    try:
+        with open(state_name, "rb") as state_file:
+            data=state_file.read()
+    except OSError:  # no state yet
+        return {}, 0
+    pos=len(STATE_MAGIC)
+    header_size=struct.calcsize(STATE_HEADER)
+    if len(data)<pos+header_size or data[:pos]!=STATE_MAGIC:
+        return {}, 0  # not a state file, or a short one
+    dev, ino, offset, head_check, tail_check=struct.unpack_from(STATE_HEADER,
+                                                                data, pos)
+    if dev!=source_stat.st_dev or ino!=source_stat.st_ino:
+        return {}, 0  # a different file, e.g. after log rotation
+    if offset<0 or offset>source_stat.st_size:
+        return {}, 0  # the file was truncated
+    if get_checks(file, offset)!=(head_check, tail_check):
+        return {}, 0  # the counted part was rewritten
+    try:
+        text=zlib.decompress(data[pos+header_size:]).decode()
+        counts=sum_lines(io.StringIO(text))
+    except (zlib.error, UnicodeDecodeError, ValueError):  # damaged sums
+        return {}, 0
+    return counts, offset
+
+def update_counts(filename, state_name):
+    """
+    This function converts a file into a dictionary
+    using the state file from an earlier run, so only
+    lines added since then are read, READ_SIZE bytes
+    at a time. The state file is then updated.
+    Arguments: filename is a string. state_name is a
+    string.
+    Return value: counts is a dictionary mapping
+    strings to integers.
+    """
+    with open(filename, "rb") as file:
+        source_stat=os.fstat(file.fileno())
+        counts, offset=load_state(state_name, source_stat, file)
+        file.seek(offset)
+        rest=b""  # start of a line that continues in the next read
+        while True:
+            data=file.read(READ_SIZE)
+            if not data:
+                break
+            data=rest+data
+            end=data.rfind(b"\n")+1  # only complete lines
+            rest=data[end:]
+            if end:
+                text=data[:end].decode()
+                make_dict(io.StringIO(text, newline=None), counts)
+                offset+=end
+        checks=get_checks(file, offset)
+    save_state(state_name, source_stat, offset, checks, counts)
+    return counts
+
+def spill_partitions(file, directory, partitions, max_keys):
+    """
+    This function sums the file like make_dict, but
+    whenever max_keys words are held the partial sums
+    are appended to partition files chosen by a hash
+    of each word.
+    Arguments: file is a .txt file opened in read mode.
+    directory is the name of a directory for the
+    partition files. partitions is a positive integer.
+    max_keys is a positive integer.
+    Return value: names is a list of the partition
+    file names.
+    """
+    names=[os.path.join(directory, "part%d" % i) for i in range(partitions)]
+    part_files=[open(name, "w") for name in names]
     counts={}
     for line in file:
         if line.strip()!="":
@@ -50,10 +297,178 @@ def make_dict(file):
                 key=line_list[0]
                 value=int(line_list[1])
                 if key not in counts:
+                    if len(counts)>=max_keys:
+                        flush_partitions(counts, part_files, 0)
+                        counts={}
                     counts[key]=0
                 counts[key]+=value
+    flush_partitions(counts, part_files, 0)
+    for part_file in part_files:
+        part_file.close()
+    return names
+
+def flush_partitions(counts, part_files, depth):
+    """
+    This function appends partial sums to the
+    partition files as word and sum lines.
+    Arguments: counts is a dictionary mapping strings
+    to integers. part_files is a list of files opened
+    in write mode. depth is the number of times the
+    words have been partitioned before.
+    """
+    for key, value in counts.items():
+        part=get_partition(key, len(part_files), depth)
+        part_files[part].write("%s %d\n" % (key, value))
+
+def get_partition(key, partitions, depth):
+    """
+    This function picks the partition of a word. Each
+    depth uses a different digit of the word's hash,
+    so splitting a partition again spreads its words.
+    Arguments: key is a string. partitions is a
+    positive integer. depth is a non-negative integer.
+    Return value: an integer from 0 to partitions-1.
+    """
+    return hash(key)//partitions**depth%partitions
+
+def sum_lines(lines, max_keys=None):
+    """
+    This function sums word and sum lines written by
+    this program. Unlike make_dict, every line is a
+    word and a sum, even if the word starts with #.
+    Arguments: lines is an iterable of strings.
+    max_keys is a positive integer, or None for no
+    limit.
+    Return value: counts is a dictionary mapping
+    strings to integers, or None if there are more
+    than max_keys words.
+    """
+    counts={}
+    for line in lines:
+        key, value=line.split()
+        if key not in counts:
+            if max_keys is not None and len(counts)>=max_keys:
+                return None
+            counts[key]=0
+        counts[key]+=int(value)
     return counts
 
+def sum_partition(name, max_keys):
+    """
+    This function sums a partition file.
+    Arguments: name is the file name of a partition.
+    max_keys is a positive integer, or None for no
+    limit.
+    Return value: counts is a dictionary mapping
+    strings to integers, or None if the partition
+    has more than max_keys words.
+    """
+    with open(name, "r") as file:
+        return sum_lines(file, max_keys)
+
+def split_partition(name, partitions, depth):
+    """
+    This function splits a partition file that has
+    too many words into smaller partition files, one
+    line at a time.
+    Arguments: name is the file name of a partition.
+    partitions is an integer of at least 2. depth is
+    the number of times the words have been
+    partitioned before.
+    Return value: names is a list of the new
+    partition file names.
+    """
+    names=["%s.%d" % (name, i) for i in range(partitions)]
+    part_files=[open(part_name, "w") for part_name in names]
+    with open(name, "r") as file:
+        for line in file:
+            key=line.split()[0]
+            part_files[get_partition(key, partitions, depth)].write(line)
+    for part_file in part_files:
+        part_file.close()
+    os.remove(name)
+    return names
+
+def spill_runs(filename, directory, partitions, max_keys):
+    """
+    This function sums a file in bounded memory. The
+    file is split into hash partitions, then each
+    partition is summed on its own and written out as
+    one run sorted by word and one sorted by sum. A
+    partition with more than max_keys words is split
+    again before it is summed.
+    Arguments: filename is a string. directory is the
+    name of a directory for temporary files.
+    partitions is a positive integer. max_keys is a
+    positive integer.
+    Return value(s): key_runs is a list of file names
+    of runs sorted by word. sum_runs is a list of file
+    names of runs sorted by sum.
+    """
+    partitions=max(2, partitions)
+    with open(filename, "r") as file:
+        names=spill_partitions(file, directory, partitions, max_keys)
+    pending=[(name, 1) for name in names]
+    key_runs=[]
+    sum_runs=[]
+    while pending:
+        name, depth=pending.pop()
+        limit=max_keys
+        if partitions**depth>=2**64:
+            limit=None  # the hash has no digits left to split on
+        counts=sum_partition(name, limit)  # each word is in one partition
+        if counts is None:
+            for part_name in split_partition(name, partitions, depth):
+                pending.append((part_name, depth+1))
+            continue
+        os.remove(name)
+        tuple_list=[(value, key) for key, value in counts.items()]
+        del counts
+        tuple_list.sort(key=lambda item: item[1])
+        key_runs.append(write_run(tuple_list, name+".keys"))
+        tuple_list.sort()
+        sum_runs.append(write_run(tuple_list, name+".sums"))
+    return key_runs, sum_runs
+
+def write_run(tuple_list, name):
+    """
+    This function writes a sorted run to a file.
+    Arguments: tuple_list is a list of value, key
+    tuples. name is the file name.
+    Return value: name is the file name.
+    """
+    with open(name, "w") as file:
+        for i in range(0, len(tuple_list), WRITE_BATCH):
+            lines=["%s %d\n" % (key, value)
+                   for value, key in tuple_list[i:i+WRITE_BATCH]]
+            file.write("".join(lines))
+    return name
+
+def read_run(name):
+    """
+    This function reads a run back one item at a time.
+    Arguments: name is the file name of a run.
+    Return value: a generator of value, key tuples.
+    """
+    with open(name, "r") as file:
+        for line in file:
+            key, value=line.split()
+            yield (int(value), key)
+
+def merge_runs(names, by_key=False):
+    """
+    This function merges sorted runs into a single
+    sorted stream without loading them into memory.
+    Arguments: names is a list of file names of runs.
+    by_key is True if the runs are sorted by word and
+    False if they are sorted by sum.
+    Return value: an iterator of value, key tuples.
+    """
+    runs=[read_run(name) for name in names]
+    if by_key:
+        return heapq.merge(*runs, key=lambda item: item[1])
+    return heapq.merge(*runs)
+
 def dict_contents(counts):
     """
     This function prints out the contents
@@ -103,17 +518,148 @@ def sorted_output(tuple_list):
     for i in range(len(tuple_list)):
         print(tuple_list[i][1], tuple_list[i][0])
 
+def select_items(counts, k, largest=True):
+    """
+    This function finds the k largest or smallest
+    items of a dictionary with a heap, without
+    sorting all of it.
+    Arguments: counts is a dictionary mapping
+    strings to integers. k is a non-negative integer.
+    largest is True for the largest items and False
+    for the smallest.
+    Return value: tuple_list is a list of value, key
+    tuples, largest first or smallest first.
+    """
+    items=((value, key) for key, value in counts.items())
+    if largest:
+        return heapq.nlargest(k, items)
+    return heapq.nsmallest(k, items)
+
+def sort_items(counts):
+    """
+    This function sorts the items of a dictionary
+    by value, then key, without printing them.
+    Arguments: counts is a dictionary mapping
+    strings to integers.
+    Return value: tuple_list is a sorted list of
+    value, key tuples.
+    """
+    tuple_list=[(value, key) for key, value in counts.items()]
+    tuple_list.sort()
+    return tuple_list
+
+def write_items(tuple_list, line_format="%s %s\n"):
+    """
+    This function writes the contents of a list of
+    tuples to the console like sorted_output, but
+    joins the lines into large writes.
+    Arguments: tuple_list is a list or iterator of
+    value, key tuples. line_format is a format string
+    taking the key and then the value.
+    """
+    sys.stdout.flush()  # keep the order of earlier print calls
+    out=sys.stdout.buffer
+    items=iter(tuple_list)
+    while True:
+        batch=list(itertools.islice(items, WRITE_BATCH))
+        if not batch:
+            break
+        lines=[line_format % (key, value) for value, key in batch]
+        out.write("".join(lines).encode())
+    out.flush()
+
+def get_args():
+    """
+    This function reads the options given on the
+    command line.
+    Return value: args is an argparse.Namespace.
+    """
+    parser=argparse.ArgumentParser()
+    parser.add_argument("--workers", type=int, default=1,
+                        help="count the file in chunks across this many "
+                             "processes")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE,
+                        help="bytes per chunk when using several workers")
+    parser.add_argument("--top", type=int, metavar="K",
+                        help="print only the K items with the largest sums")
+    parser.add_argument("--bottom", type=int, metavar="K",
+                        help="print only the K items with the smallest sums")
+    parser.add_argument("--quiet", action="store_true",
+                        help="print only the final output")
+    parser.add_argument("--memory-limit", type=int, metavar="MB",
+                        help="spill partial sums to disk to keep about "
+                             "this much memory in use")
+    parser.add_argument("--partitions", type=int, default=PARTITIONS,
+                        help="number of partitions used with "
+                             "--memory-limit")
+    parser.add_argument("--state", metavar="FILE",
+                        help="keep sums in FILE and only read lines added "
+                             "since the last run")
+    args=parser.parse_args()
+    if args.memory_limit is not None:
+        if args.state is not None:
+            parser.error("--memory-limit can't be used with --state")
+        if args.workers>1:
+            parser.error("--memory-limit can't be used with --workers")
+    if args.state is not None and args.workers>1:
+        parser.error("--state can't be used with --workers")
+    return args
+
 def main():
+    args=get_args()
     user_input=input("File to scan: ")
     user_input=user_input.strip()
-    file=open(user_input, "r") 
-    counts=make_dict(file)
-    key_list=dict_contents(counts)
-    tuple_list=make_list(counts, key_list)
-    sorted_output(tuple_list)
+    if args.memory_limit is not None:
+        spill_main(user_input, args)
+        return
+    if args.state is not None:
+        counts=update_counts(user_input, args.state)
+    elif args.workers>1:
+        counts=make_dict_parallel(user_input, args.workers, args.chunk_size)
+    else:
+        file=open(user_input, "r") 
+        counts=make_dict(file)
+    if args.top is not None or args.bottom is not None:
+        if args.top is not None:
+            tuple_list=select_items(counts, args.top)
+        else:
+            tuple_list=select_items(counts, args.bottom, largest=False)
+    elif args.quiet:
+        tuple_list=sort_items(counts)
+    else:
+        key_list=dict_contents(counts)
+        tuple_list=make_list(counts, key_list)
+        sorted_output(tuple_list)
+        return
+    if not args.quiet:
+        print("STEP 4: THE ACTUAL OUTPUT")
+    write_items(tuple_list)
 
-main()
-    
-    
-            
+def spill_main(filename, args):
+    """
+    This function prints the output for a file summed
+    on disk with spill_runs. STEP 1 and the final
+    output are streamed from merged runs.
+    Arguments: filename is a string. args is an
+    argparse.Namespace from get_args.
+    """
+    max_keys=max(1, args.memory_limit*1024*1024//ENTRY_SIZE)
+    with tempfile.TemporaryDirectory() as directory:
+        key_runs, sum_runs=spill_runs(filename, directory, args.partitions,
+                                      max_keys)
+        if not args.quiet and args.top is None and args.bottom is None:
+            print("STEP 1: THE ORIGINAL DICTIONARY")
+            write_items(merge_runs(key_runs, by_key=True),
+                        "  Key: %s Value: %s\n")
+            print()
+        tuple_list=merge_runs(sum_runs)
+        if args.top is not None:
+            tuple_list=heapq.nlargest(args.top, tuple_list)
+        elif args.bottom is not None:
+            tuple_list=itertools.islice(tuple_list, args.bottom)
+        if not args.quiet:
+            print("STEP 4: THE ACTUAL OUTPUT")
+        write_items(tuple_list)
 
+if __name__=="__main__":
+    main()
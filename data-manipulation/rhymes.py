@@ -10,145 +10,612 @@ consistent formatting (e.g. all lower, all upper).
 The user can then enter words, one by one, and, for each one, the program
 will display all rhymes (according to the pronunciation dictionary) for that
 word. This means the words have to be in the dictionary.
+
+The parsed dictionary is saved in a compiled cache file next to the dictionary
+file, so later runs can load it without parsing the file again. The cache is
+rebuilt whenever the dictionary file changes.
+
+A whole word list can also be handled at once with
+    python rhymes.py batch DICTIONARY [WORDLIST]
+where the word list (one word per line) is read from a file or from stdin.
+Each distinct word is shown once, in the order it first appears. Blank lines
+and lines with more than one word are skipped.
 """
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+CACHE_MAGIC=b"RHYMES-CACHE-2\n"  # first bytes of every cache file
+CACHE_SECTIONS=11  # arrays saved by compile_dictionary
+BATCH_SIZE=10000  # words handled together in batch mode
 
 def get_file():
     """
-    This function gets a file name from the user and opens the file with that
-    name in read mode.
-    Return value: file is a file object opened in read mode.
+    This function gets a file name from the user.
+    Return value: filename is a string.
     """
     filename=input()
-    file=open(filename, "r")
-    return file
+    return filename
 
 def make_dictionary(file):
     """
     This function places the contents of a pronunciation dictionary file in a
-    dictionary object so that it can be more easily used and accessed by the
-    program.
+    compact PronunciationDictionary so that it can be more easily used and
+    accessed by the program. Each phoneme string is given a number the first
+    time it is seen, and each pronunciation is stored as the bytes of its
+    phoneme numbers. It also builds an index of the words by their rhyme
+    tails (the stressed phoneme and everything after it), so rhymes can be
+    looked up without checking every word in the dictionary.
     Argument: file is a file object.
-    Return value: dictionary is a dictionary mapping word strings to 2D arrays
-    of the phoneme strings representing those words' pronunciations.
+    Return values: dictionary is a PronunciationDictionary.
+    index is a RhymeIndex.
     """
-    dictionary={}
+    symbol_ids={}  # maps phoneme strings to their numbers
+    pronuncs={}  # maps words to their encoded pronunciations while reading
     for line in file:
         entry=line.strip().split()  # remove newline and split on whitespaces
         word=entry[0]
-        phonemes=entry[1:]
-        if word not in dictionary:  # create a new entry
-            dictionary[word]=[]
-        dictionary[word].append(phonemes)  # handles multiple pronunciations
-    return dictionary
+        ids=[symbol_ids.setdefault(phoneme, len(symbol_ids))
+             for phoneme in entry[1:]]
+        if word not in pronuncs:  # create a new entry
+            pronuncs[word]=[]
+        pronuncs[word].append(array("H", ids).tobytes())  # handles multiple
+    dictionary=pack_dictionary(list(symbol_ids), pronuncs)  # pronunciations
+    return dictionary, make_rhyme_index(dictionary)
+
+class PronunciationDictionary:
+    """
+    This class is a read-only pronunciation dictionary stored in a few flat
+    arrays instead of a list of strings per pronunciation. The words are
+    kept in one sorted block of bytes and found by binary search. Each
+    pronunciation is a slice of one block of phoneme numbers, two bytes per
+    phoneme, so pronunciations can be compared as bytes.
+    """
+    def __init__(self, symbols, words, word_starts, word_prons, pron_starts,
+                 phonemes):
+        """
+        The initializer stores the arrays making up the dictionary.
+        Arguments: symbols is an array of phoneme strings.
+        words is a bytes-like object with the sorted words, one after another.
+        word_starts holds the position of each word in words (with one extra
+        entry at the end).
+        word_prons holds, for each word, the number of its first
+        pronunciation (with one extra entry at the end).
+        pron_starts holds the position of each pronunciation in phonemes
+        (with one extra entry at the end).
+        phonemes is a bytes-like object with every pronunciation, one after
+        another.
+        """
+        self.symbols=symbols
+        self.stressed=bytes(int("1" in symbol) for symbol in symbols)
+        self.words=words
+        self.word_starts=word_starts
+        self.word_prons=word_prons
+        self.pron_starts=pron_starts
+        self.phonemes=phonemes
+    def get_word(self, i):
+        """
+        This function gets a word from its number.
+        Argument: i is a non-negative integer.
+        Return value: a string.
+        """
+        return str(self.words[self.word_starts[i]:self.word_starts[i+1]],
+                   "utf-8")
+    def find(self, word):
+        """
+        This function finds the number of a word by binary search.
+        Argument: word is a string.
+        Return value: an integer, or -1 if the word isn't in the dictionary.
+        """
+        key=word.encode()
+        low=0
+        high=len(self)
+        while low<high:
+            mid=(low+high)//2
+            if bytes(self.words[self.word_starts[mid]:
+                                self.word_starts[mid+1]])<key:
+                low=mid+1
+            else:
+                high=mid
+        if low<len(self) and \
+           self.words[self.word_starts[low]:self.word_starts[low+1]]==key:
+            return low
+        return -1
+    def get_pronuncs(self, i):
+        """
+        This function gets the pronunciations of a word from its number.
+        Argument: i is a non-negative integer.
+        Return value: an array of bytes objects.
+        """
+        starts=self.pron_starts
+        return [bytes(self.phonemes[starts[pron]:starts[pron+1]])
+                for pron in range(self.word_prons[i], self.word_prons[i+1])]
+    def get_phonemes(self, pron):
+        """
+        This function turns a pronunciation back into phoneme strings.
+        Argument: pron is a bytes object.
+        Return value: an array of strings.
+        """
+        return [self.symbols[i] for i in memoryview(pron).cast("H")]
+    def __contains__(self, word):
+        return self.find(word)!=-1
+    def __getitem__(self, word):
+        i=self.find(word)
+        if i==-1:
+            raise KeyError(word)
+        return self.get_pronuncs(i)
+    def __len__(self):
+        return len(self.word_starts)-1
+
+def pack_dictionary(symbols, pronuncs):
+    """
+    This function packs words and their encoded pronunciations into a
+    PronunciationDictionary.
+    Arguments: symbols is an array of phoneme strings.
+    pronuncs is a dictionary mapping word strings to arrays of bytes objects.
+    Return value: a PronunciationDictionary.
+    """
+    words=sorted(word.encode() for word in pronuncs)
+    word_starts=array("I", [0])
+    word_prons=array("I", [0])
+    pron_starts=array("I", [0])
+    phonemes=bytearray()
+    for word in words:
+        word_starts.append(word_starts[-1]+len(word))
+        for pron in pronuncs[word.decode()]:
+            phonemes+=pron
+            pron_starts.append(len(phonemes))
+        word_prons.append(len(pron_starts)-1)
+    return PronunciationDictionary(symbols, b"".join(words), word_starts,
+                                   word_prons, pron_starts, bytes(phonemes))
+
+class RhymeIndex:
+    """
+    This class maps rhyme tails to the words with a pronunciation ending in
+    them. The entries for all the tails are kept in two flat arrays.
+    """
+    def __init__(self, tails, tail_entries, entry_words, entry_precedes):
+        """
+        The initializer stores the arrays making up the index.
+        Arguments: tails is a dictionary mapping the bytes of each rhyme tail
+        to its number.
+        tail_entries holds, for each tail, the position of its first entry
+        (with one extra entry at the end).
+        entry_words and entry_precedes hold the word number and the phoneme
+        number of the preceding phoneme of each entry.
+        """
+        self.tails=tails
+        self.tail_entries=tail_entries
+        self.entry_words=entry_words
+        self.entry_precedes=entry_precedes
+    def get(self, end, default=None):
+        """
+        This function looks up the entries for a rhyme tail.
+        Arguments: end is a bytes object.
+        default is returned if the tail isn't in the index.
+        Return value: an array of (word number, precede) tuples.
+        """
+        tail=self.tails.get(end)
+        if tail is None:
+            return default
+        return [(self.entry_words[k], self.entry_precedes[k])
+                for k in range(self.tail_entries[tail],
+                               self.tail_entries[tail+1])]
+
+def make_rhyme_index(dictionary):
+    """
+    This function maps each rhyme tail in a dictionary to the words with a
+    pronunciation ending in it, along with the phoneme right before the tail.
+    Pronunciations whose stressed phoneme is first are left out, since they
+    can't rhyme with anything.
+    Argument: dictionary is a PronunciationDictionary.
+    Return value: a RhymeIndex.
+    """
+    groups={}  # maps tails to arrays of (word number, precede) tuples
+    for i in range(len(dictionary)):
+        for pron in dictionary.get_pronuncs(i):
+            precede, end=split_phonemes(pron, dictionary.stressed)
+            if precede is None:
+                continue
+            if end not in groups:
+                groups[end]=[]
+            groups[end].append((i, precede))
+    tails={}
+    tail_entries=array("I", [0])
+    entry_words=array("I")
+    entry_precedes=array("H")
+    for end, entries in groups.items():
+        tails[end]=len(tails)
+        for word, precede in entries:
+            entry_words.append(word)
+            entry_precedes.append(precede)
+        tail_entries.append(len(entry_words))
+    return RhymeIndex(tails, tail_entries, entry_words, entry_precedes)
+
+def compile_dictionary(dictionary, index):
+    """
+    This function gets the arrays of a dictionary and rhyme index as the
+    sections that are saved in a cache file.
+    Arguments: dictionary is a PronunciationDictionary.
+    index is a RhymeIndex.
+    Return value: sections is an array of bytes objects, in the order
+    load_cache expects.
+    """
+    tails=sorted(index.tails, key=index.tails.get)  # in order of number
+    tail_starts=array("I", [0])
+    for tail in tails:
+        tail_starts.append(tail_starts[-1]+len(tail))
+    return ["\n".join(dictionary.symbols).encode(), dictionary.words,
+            bytes(dictionary.word_starts), bytes(dictionary.word_prons),
+            bytes(dictionary.pron_starts), dictionary.phonemes,
+            b"".join(tails), tail_starts.tobytes(),
+            bytes(index.tail_entries), bytes(index.entry_words),
+            bytes(index.entry_precedes)]
+
+def save_cache(cache_name, source_stat, sections):
+    """
+    This function writes a cache file. The header records the size and
+    modification time of the source file, and each section is padded so the
+    next one starts on an 8 byte boundary. The file is written under a
+    temporary name and then renamed, so a crash or another run never sees a
+    partly written cache.
+    Arguments: cache_name is a string.
+    source_stat is the os.stat result of the source file.
+    sections is an array of bytes objects.
+    """
+    temp_name="%s.%d.tmp" % (cache_name, os.getpid())
+    try:
+        with open(temp_name, "wb") as file:
+            file.write(CACHE_MAGIC)
+            file.write(struct.pack("<qqq", source_stat.st_size,
+                                   source_stat.st_mtime_ns, len(sections)))
+            for section in sections:
+                file.write(struct.pack("<q", len(section)))
+                file.write(section)
+                file.write(b"\0"*(-len(section)%8))  # padding
+        os.replace(temp_name, cache_name)
+    except OSError:
+        if os.path.exists(temp_name):
+            os.remove(temp_name)
+        raise
+
+def get_sections(data, source_stat):
+    """
+    This function checks the header of a cache file and finds where each
+    section is, without copying anything.
+    Arguments: data is a bytes-like object with the contents of the file.
+    source_stat is the os.stat result of the source file.
+    Return value: spans is an array of (start, length) tuples, or None if
+    the cache is out of date or damaged.
+    """
+    pos=len(CACHE_MAGIC)
+    if len(data)<pos+24 or data[:pos]!=CACHE_MAGIC:
+        return None
+    size, mtime, count=struct.unpack_from("<qqq", data, pos)
+    if size!=source_stat.st_size or mtime!=source_stat.st_mtime_ns:
+        return None  # source file changed since the cache was made
+    if count!=CACHE_SECTIONS:
+        return None
+    pos+=24
+    spans=[]
+    for k in range(count):
+        if pos+8>len(data):
+            return None  # a short file
+        length=struct.unpack_from("<q", data, pos)[0]
+        if length<0 or pos+8+length>len(data):
+            return None  # a damaged section length
+        spans.append((pos+8, length))
+        pos+=8+length+(-length%8)
+    for k in (2, 3, 4, 7, 8, 9):
+        if spans[k][1]%4!=0:
+            return None  # not a whole number of array items
+    if spans[10][1]%2!=0:
+        return None
+    return spans
+
+def load_cache(cache_name, source_stat):
+    """
+    This function loads a dictionary and rhyme index from a cache file by
+    memory mapping it. The word and phoneme blocks and the arrays are used
+    in place, so nothing is parsed; only the small symbol and tail sections
+    are copied out.
+    Arguments: cache_name is a string.
+    source_stat is the os.stat result of the source file.
+    Return values: dictionary is a PronunciationDictionary and index is a
+    RhymeIndex, or both are None if the cache is missing, out of date or
+    damaged.
+    """
+    try:
+        with open(cache_name, "rb") as file:
+            data=mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):  # no cache yet, or an empty file
+        return None, None
+    spans=get_sections(data, source_stat)
+    if spans is None:
+        data.close()
+        return None, None
+    view=memoryview(data)
+    sections=[view[start:start+length] for start, length in spans]
+    symbols=bytes(sections[0]).decode().split("\n")
+    dictionary=PronunciationDictionary(symbols, sections[1],
+                                       sections[2].cast("I"),
+                                       sections[3].cast("I"),
+                                       sections[4].cast("I"),
+                                       sections[5])
+    tail_bytes=bytes(sections[6])
+    tail_starts=sections[7].cast("I")
+    tails={}
+    for tail in range(len(tail_starts)-1):
+        tails[tail_bytes[tail_starts[tail]:tail_starts[tail+1]]]=tail
+    index=RhymeIndex(tails, sections[8].cast("I"), sections[9].cast("I"),
+                     sections[10].cast("H"))
+    return dictionary, index
+
+def load_dictionary(filename):
+    """
+    This function loads a pronunciation dictionary and its rhyme index. A
+    compiled cache is kept next to the dictionary file (with .cache added to
+    its name); it is used if it's newer than the last change to the file, and
+    otherwise the file is parsed and the cache is rewritten.
+    Argument: filename is a string.
+    Return values: dictionary is a PronunciationDictionary.
+    index is a RhymeIndex.
+    """
+    source_stat=os.stat(filename)
+    cache_name=filename+".cache"
+    dictionary, index=load_cache(cache_name, source_stat)
+    if dictionary is not None:
+        return dictionary, index
+    file=open(filename, "r")
+    dictionary, index=make_dictionary(file)
+    file.close()
+    try:
+        save_cache(cache_name, source_stat,
+                   compile_dictionary(dictionary, index))
+    except OSError:  # e.g. no permission to write next to the file
+        pass
+    return dictionary, index
 
 def get_pronunc(word, dictionary):
     """
     This function finds the pronunciations of a word if it is contained in
     the dictionary.
     Arguments: word is a string.
-    dictionary is a dictionary mapping strings to 2D arrays of strings.
-    Return value: either a 2D array of strings or a None type object.
+    dictionary is a PronunciationDictionary.
+    Return value: either an array of bytes objects or a None type object.
     """
     word=word.upper()  # case insensitive search
     if word in dictionary:
         return dictionary[word]
     return None  # if word's pronunciation isn't in dictionary
 
-def split_phonemes(phonemes):
+def split_phonemes(pron, stressed):
     """
     This function splits the phonemes of a word into the stressed phoneme and
     everything following it, and the phoneme right before the stressed one.
-    Argument: phonemes is an array of strings.
-    Return values: precede is a string or a None type object.
-    end is a string.
+    Arguments: pron is a bytes object of phoneme numbers, two bytes each.
+    stressed is a bytes object; stressed[i] is 1 if phoneme i is stressed.
+    Return values: precede is an integer or a None type object.
+    end is a bytes object.
     """
+    ids=memoryview(pron).cast("H")
     stress=0
-    for i in range(len(phonemes)):
-        if "1" in phonemes[i]:  # finds stressed phoneme
+    for i in range(len(ids)-1, 0, -1):  # finds the last stressed phoneme
+        if stressed[ids[i]]:
             stress=i
-        if stress!=0:  # if stressed phoneme isn't first
-            precede=phonemes[stress-1]
-        else:  # is stressed phoneme is first, there is no preceding phoneme
-            precede=None
-        end=phonemes[stress:]
-    return precede, end
-            
+            break
+    if stress==0:  # if stressed phoneme is first (or there isn't one), there
+        return None, pron  # is no preceding phoneme
+    return ids[stress-1], pron[2*stress:]
 
-def is_rhyme(pronunc1, pronunc2):
+def is_rhyme(pronunc1, pronunc2, stressed):
     """
     This function determines if the pronunciations of two words rhyme with
     each other.
-    Arguments: pronunc1 is a 2D array of strings.
-    pronunc2 is a 2D array of strings.
+    Arguments: pronunc1 is an array of bytes objects.
+    pronunc2 is an array of bytes objects.
+    stressed is a bytes object, as in split_phonemes.
     Return value: a Boolean
     """
     for phonemes in pronunc1:  # handle multiple pronunciations
-        precede1, end1 = split_phonemes(phonemes)
+        precede1, end1 = split_phonemes(phonemes, stressed)
         for phonemes in pronunc2:
-            precede2, end2 = split_phonemes(phonemes)
-            if not precede1 or not precede2:  # if stressed phoneme is first
-                return False
+            precede2, end2 = split_phonemes(phonemes, stressed)
+            if precede1 is None or precede2 is None:  # if stressed phoneme
+                return False  # is first
             if precede2!=precede1 and end2==end1:  # checks for perfect rhymes
                 return True
     return False
 
-def get_rhymes(word, dictionary):
+def get_candidates(entries, precede1, candidates):
+    """
+    This function adds the words of rhyme index entries whose preceding
+    phoneme differs from a word's to a set of candidate rhymes.
+    Arguments: entries is an array of (word number, precede) tuples.
+    precede1 is an integer.
+    candidates is a set of word numbers.
+    """
+    for entry, precede2 in entries:
+        if precede2!=precede1:  # perfect rhymes only
+            candidates.add(entry)
+
+def confirm_rhymes(pronunc1, candidates, dictionary):
+    """
+    This function checks candidate rhymes with the full is_rhyme check.
+    Arguments: pronunc1 is an array of bytes objects.
+    candidates is a set of word numbers.
+    dictionary is a PronunciationDictionary.
+    Return value: rhymes is an array of strings, in alphabetic order.
+    """
+    rhymes=[]
+    for entry in sorted(candidates):  # word numbers are in alphabetic order
+        if is_rhyme(pronunc1, dictionary.get_pronuncs(entry),
+                    dictionary.stressed):
+            rhymes.append(dictionary.get_word(entry))
+    return rhymes
+
+def get_rhymes(word, dictionary, index):
     """
     This function finds all the rhymes of a word that are contained in the
-    dictionary.
+    dictionary. Only the words sharing a rhyme tail with the word, with a
+    different phoneme before it, need to be checked.
     Arguments: word is a string.
-    dictionary is a dictionary mapping strings to 2D arrays of strings.
+    dictionary is a PronunciationDictionary.
+    index is a RhymeIndex.
     Return value: rhymes is an array of strings.
     """
     pronunc1=get_pronunc(word, dictionary)
     rhymes=[]
     if pronunc1 is not None:  # if word's pronunc was found in dictionary
-        for entry, pronunc2 in dictionary.items():
-            if is_rhyme(pronunc1, pronunc2):
-                rhymes.append(entry)
+        candidates=set()
+        for phonemes in pronunc1:
+            precede1, end1=split_phonemes(phonemes, dictionary.stressed)
+            if precede1 is not None:
+                get_candidates(index.get(end1, []), precede1, candidates)
+        rhymes=confirm_rhymes(pronunc1, candidates, dictionary)
     return rhymes
 
-def show_rhymes(word, dictionary):
+def get_batch_rhymes(words, dictionary, index):
     """
-    This function prints a message to the console showing the rhymes of a word
-    if they exist.
+    This function finds the rhymes of many words at once. Each word's rhyme
+    tails are worked out once, and the words are grouped by tail so each
+    tail is only looked up in the index once.
+    Arguments: words is an array of distinct uppercase strings.
+    dictionary is a PronunciationDictionary.
+    index is a RhymeIndex.
+    Return value: results is a dictionary mapping each word to an array of
+    strings.
+    """
+    groups={}  # maps tails to the (word, precede) pairs that end in them
+    pronuncs={}
+    for word in words:
+        pronuncs[word]=get_pronunc(word, dictionary)
+        if pronuncs[word] is None:
+            continue
+        for phonemes in pronuncs[word]:
+            precede1, end1=split_phonemes(phonemes, dictionary.stressed)
+            if precede1 is not None:
+                if end1 not in groups:
+                    groups[end1]=[]
+                groups[end1].append((word, precede1))
+    candidates={word: set() for word in words}
+    for end1, group in groups.items():
+        entries=index.get(end1, [])  # one lookup for the whole group
+        for word, precede1 in group:
+            get_candidates(entries, precede1, candidates[word])
+    results={}
+    for word in words:
+        results[word]=[]
+        if pronuncs[word] is not None:
+            results[word]=confirm_rhymes(pronuncs[word], candidates[word],
+                                         dictionary)
+    return results
+
+def format_rhymes(word, rhymes):
+    """
+    This function makes the message showing the rhymes of a word.
     Arguments: word is a string.
-    dictionary is a dictionary mapping strings to 2D arrays of strings.
+    rhymes is an array of strings, in alphabetic order.
+    Return value: a string, ending in a blank line.
     """
-    rhymes=get_rhymes(word, dictionary)
-    rhymes.sort()  # show rhymes in alphabetic order
-    print("Rhymes for:", word.upper())
+    lines=["Rhymes for: "+word.upper()]
     if len(rhymes)==0:  # word has no rhymes
-        print("  -- none found --  ")
+        lines.append("  -- none found --  ")
     else:
         for rhyme in rhymes:
-            print("  "+rhyme)
-    
+            lines.append("  "+rhyme)
+    lines.append("\n")
+    return "\n".join(lines)
+
+def show_rhymes(word, dictionary, index):
+    """
+    This function prints a message to the console showing the rhymes of a word
+    if they exist.
+    Arguments: word is a string.
+    dictionary is a PronunciationDictionary.
+    index is a RhymeIndex.
+    """
+    rhymes=get_rhymes(word, dictionary, index)
+    sys.stdout.write(format_rhymes(word, rhymes))
             
-def handle_word(word, dictionary):
+def handle_word(word, dictionary, index):
     """
     This function prints a message to the console that gives the user
     information about their input word.
     Arguments: word is a string.
-    dictionary is a dictionary mapping strings to 2D arrays of strings.
+    dictionary is a PronunciationDictionary.
+    index is a RhymeIndex.
     """
     if word.strip()=="":  # blank line
         print("No word given")
+        print()
     elif len(word.split())!=1:  # multiple words on a line
         print("Multiple words entered, please enter only one word at a time.")
+        print()
     else:
-        show_rhymes(word, dictionary)    
-    print()        
-    
+        show_rhymes(word, dictionary, index)
+
+def run_batch(file, dictionary, index):
+    """
+    This function shows the rhymes of every word in a word list, one word
+    per line. Repeated words are only shown once, and blank lines and lines
+    with more than one word are skipped. The words are handled
+    BATCH_SIZE at a time, and the output of each batch is written in one
+    call.
+    Arguments: file is a file object.
+    dictionary is a PronunciationDictionary.
+    index is a RhymeIndex.
+    """
+    seen=set()
+    batch=[]
+    for line in file:
+        word=line.strip().upper()
+        if len(word.split())!=1:  # a blank line or several words
+            continue
+        if word in seen:  # only show each word once
+            continue
+        seen.add(word)
+        batch.append(word)
+        if len(batch)==BATCH_SIZE:
+            write_batch(batch, dictionary, index)
+            batch=[]
+    write_batch(batch, dictionary, index)
+
+def write_batch(words, dictionary, index):
+    """
+    This function writes the rhymes of a batch of words to the console.
+    Arguments: words is an array of distinct uppercase strings.
+    dictionary is a PronunciationDictionary.
+    index is a RhymeIndex.
+    """
+    results=get_batch_rhymes(words, dictionary, index)
+    sys.stdout.write("".join(format_rhymes(word, results[word])
+                             for word in words))
+    sys.stdout.flush()
+
 def main(): 
-    file=get_file()
-    dictionary=make_dictionary(file)
+    if len(sys.argv)>1 and sys.argv[1]=="batch":
+        if len(sys.argv)<3:
+            print("Usage: python rhymes.py batch DICTIONARY [WORDLIST]")
+            return
+        dictionary, index=load_dictionary(sys.argv[2])
+        if len(sys.argv)>3:
+            file=open(sys.argv[3], "r")
+            run_batch(file, dictionary, index)
+            file.close()
+        else:
+            run_batch(sys.stdin, dictionary, index)
+        return
+    filename=get_file()
+    dictionary, index=load_dictionary(filename)
     while True:
         try:
             word=input()
-            handle_word(word, dictionary)
-        except Exception:  # end at EOF
+        except EOFError:
             break
+        handle_word(word, dictionary, index)
 
-main()
-        
\ No newline at end of file
+if __name__=="__main__":
+    main()
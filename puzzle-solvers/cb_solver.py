@@ -5,6 +5,14 @@ Purpose: Provides functions to help with solving a 15-peg cracker barrel
 puzzle.
 https://blog.crackerbarrel.com/2021/08/13/how-to-beat-the-cracker-barrel-peg-game/
 """
+import concurrent.futures
+import itertools
+
+MOVE_TABLES={}  # per-hole move tables, keyed by board size
+SYMMETRY_TABLES={}  # symmetry lookup tables, keyed by board size
+WORKER_TABLES={}  # transposition tables of a batch worker, keyed by size
+WORKER_MAX_SIZE=None  # size limit of each of those tables
+
 def make_board(encoding):
     """
     This function makes a 2D array representing the board from a string 
@@ -80,7 +88,7 @@ def get_destinations(board, i):
     i is an integer representing the encoding index of the position.
     Return value: a 2D array of tuples of integers.
     """
-    height=5  # board has 5 rows
+    height=len(board)
     directions=[]
     row, col=get_board_index(height, i)
     if col+2<len(board[row]):  # if peg can hop to the right
@@ -90,16 +98,18 @@ def get_destinations(board, i):
         directions.append([(row+1, col+1), (row+2, col+2)])
     return directions
         
-def get_all_conceivable_moves():
+def get_all_conceivable_moves(size=15):
     """
-    This function gets all the legal moves for a 15-peg cracker barrel puzzle
+    This function gets all the legal moves for a cracker barrel puzzle
     board as 3 element tuples of the starting position, position that gets 
     hopped over, and end position.
+    Argument: size is the number of positions on the board; it should be a
+    triangular number (15 for the usual 5 row board).
     Return value: an array of tuples of integers.
     """
-    board=make_board("0"*15)  # make board using dummy encoding
+    board=make_board("0"*size)  # make board using dummy encoding
     moves=set()
-    for i in range(15):  # find all moves from each position
+    for i in range(size):  # find all moves from each position
         destinations=get_destinations(board, i)
         for destination in destinations:
             over=destination[0]  # ending position
@@ -113,17 +123,19 @@ def get_all_conceivable_moves():
 def get_moves(encoding):
     """
     This function gets all the legal moves given a specific encoding, or board
-    setup. It first generates all the conceivable moves, then selects which
-    ones are valid from the current position.
+    setup. Only the conceivable moves that land in an empty position are
+    checked.
     Argument: encoding is a string of 1 and 0 characters.
     moves is an array of tuples of integers.
     """
     moves=set()
-    conceivable_moves=get_all_conceivable_moves()
-    for move in conceivable_moves:
-        if encoding[move[0]]=="1" and encoding[move[1]]=="1":  # peg hops over
-            if encoding[move[2]]=="0":  # peg and lands in empty space
-                moves.add(move)
+    hole_moves=get_move_tables(len(encoding))
+    for i in range(len(encoding)):
+        if encoding[i]=="0":  # only moves into an empty space can apply
+            for move_mask in hole_moves[i]:
+                move=move_mask[0]
+                if encoding[move[0]]=="1" and encoding[move[1]]=="1":
+                    moves.add(move)  # peg hops over a peg into the space
     return moves
 
 def get_new_encoding(move, encoding):
@@ -139,38 +151,557 @@ def get_new_encoding(move, encoding):
     encoding_list[move[2]]="1"
     return "".join(encoding_list)  # convert back to string
 
-def cb_all(encoding):
+def encoding_to_bits(encoding):
     """
-    This function gets all possible solutions given an initial board state and
-    returns them as lists of moves to get from the starting condition to a
-    solved board.
+    This function converts a string encoding of the board into a bitboard,
+    where bit i of the integer is set if position i has a peg.
     Argument: encoding is a string of 1 and 0 characters.
+    Return value: bits is a non-negative integer.
+    """
+    bits=0
+    for i in range(len(encoding)):
+        if encoding[i]=="1":
+            bits|=1<<i  # set the bit for each peg
+    return bits
+
+def bits_to_encoding(bits, size=15):
+    """
+    This function converts a bitboard back into a string encoding.
+    Arguments: bits is a non-negative integer.
+    size is the number of positions on the board.
+    Return value: a string of 1 and 0 characters.
+    """
+    return "".join("1" if bits>>i&1 else "0" for i in range(size))
+
+def get_move_masks(moves):
+    """
+    This function precomputes bitmasks for a collection of moves so they can
+    be checked and applied to a bitboard without touching any strings.
+    Argument: moves is a collection of tuples of integers.
+    Return value: an array of tuples (move, jump, full), where jump has the
+    start and hopped over bits set and full additionally has the end bit set.
+    """
+    move_masks=[]
+    for move in sorted(moves):  # sorted so search order is deterministic
+        jump=(1<<move[0])|(1<<move[1])
+        move_masks.append((move, jump, jump|(1<<move[2])))
+    return move_masks
+
+def get_hole_index(move_masks, size):
+    """
+    This function groups move masks by the position they land in, so only
+    the moves into empty positions need to be checked.
+    Arguments: move_masks is an array of tuples as returned by get_move_masks.
+    size is the number of positions on the board.
+    Return value: hole_moves is a 2D array; hole_moves[i] holds the move masks
+    that end at position i.
+    """
+    hole_moves=[[] for i in range(size)]
+    for move_mask in move_masks:
+        hole_moves[move_mask[0][2]].append(move_mask)
+    return hole_moves
+
+def get_move_tables(size=15):
+    """
+    This function gets the per-hole move table for a board size. Tables are
+    built the first time a size is used and then reused.
+    Argument: size is the number of positions on the board.
+    Return value: a 2D array as returned by get_hole_index.
+    """
+    if size not in MOVE_TABLES:
+        move_masks=get_move_masks(get_all_conceivable_moves(size))
+        MOVE_TABLES[size]=get_hole_index(move_masks, size)
+    return MOVE_TABLES[size]
+
+def get_moves_bits(bits, hole_moves):
+    """
+    This function gets all the legal moves for a bitboard. Only the moves
+    that land in one of the board's empty positions are checked.
+    Arguments: bits is a non-negative integer.
+    hole_moves is a 2D array as returned by get_hole_index.
+    Return value: an array of tuples as returned by get_move_masks.
+    """
+    moves=[]
+    empty=~bits&((1<<len(hole_moves))-1)
+    while empty:
+        hole=empty&-empty  # lowest empty position
+        empty^=hole
+        for move_mask in hole_moves[hole.bit_length()-1]:
+            if bits&move_mask[1]==move_mask[1]:  # pegs to hop over the hole
+                moves.append(move_mask)
+    return moves
+
+def get_new_bits(move_mask, bits):
+    """
+    This function generates a new bitboard resulting from a move being made.
+    Since a legal move always flips the start, hopped over and end positions,
+    this is a single XOR.
+    Arguments: move_mask is a tuple as returned by get_move_masks.
+    bits is a non-negative integer.
+    Return value: a non-negative integer.
+    """
+    return bits^move_mask[2]
+
+def get_height(size):
+    """
+    This function gets the number of rows of a triangular board.
+    Argument: size is the number of positions on the board.
+    Return value: height is a non-negative integer.
+    """
+    height=0
+    while (height+1)*(height+2)//2<=size:  # add rows while they still fit
+        height+=1
+    return height
+
+def get_symmetries(size=15):
+    """
+    This function gets the 6 symmetries of a triangular board (3 rotations,
+    each with and without a reflection) as permutations of the positions.
+    Each position is described by its distances from the three sides of the
+    triangle, and every symmetry is a reordering of those three distances.
+    Argument: size is the number of positions on the board.
+    Return value: symmetries is a 2D array of integers; symmetries[k][i] is
+    the position that position i is moved to by symmetry k. The first
+    symmetry is the identity.
+    """
+    height=get_height(size)
+    orders=[(0, 1, 2), (1, 2, 0), (2, 0, 1), (0, 2, 1), (2, 1, 0), (1, 0, 2)]
+    symmetries=[]
+    for order in orders:
+        perm=[]
+        for i in range(size):
+            row, col=get_board_index(height, i)
+            dists=(row-col, col, height-1-row)  # distances from the 3 sides
+            new_row=dists[order[0]]+dists[order[1]]
+            new_col=dists[order[1]]
+            perm.append(get_encoding_index(new_row, new_col))
+        symmetries.append(perm)
+    return symmetries
+
+def get_symmetry_tables(size=15):
+    """
+    This function gets lookup tables for applying each symmetry of the board
+    to a bitboard 8 positions at a time. Tables are built the first time a
+    size is used and then reused.
+    Argument: size is the number of positions on the board.
+    Return value: a 3D array; tables[k][chunk][byte] is the bitboard that the
+    pegs in byte (positions 8*chunk to 8*chunk+7) are moved to by symmetry k.
+    """
+    if size not in SYMMETRY_TABLES:
+        tables=[]
+        for perm in get_symmetries(size):
+            chunks=[]
+            for start in range(0, size, 8):
+                chunk=[0]*256
+                for byte in range(256):
+                    for j in range(8):
+                        if byte>>j&1 and start+j<size:
+                            chunk[byte]|=1<<perm[start+j]
+                chunks.append(chunk)
+            tables.append(chunks)
+        SYMMETRY_TABLES[size]=tables
+    return SYMMETRY_TABLES[size]
+
+def transform_bits(bits, chunks):
+    """
+    This function applies a symmetry to a bitboard.
+    Arguments: bits is a non-negative integer.
+    chunks is one symmetry's entry in the array from get_symmetry_tables.
+    Return value: new_bits is a non-negative integer.
+    """
+    new_bits=0
+    for chunk in chunks:
+        new_bits|=chunk[bits&255]
+        bits>>=8  # move on to the next 8 positions
+    return new_bits
+
+def canonicalize_bits(bits, size=15):
+    """
+    This function finds the canonical form of a bitboard, which is the
+    smallest bitboard among all of its symmetric versions. Symmetric boards
+    have the same canonical form.
+    Arguments: bits is a non-negative integer.
+    size is the number of positions on the board.
+    Return values: canonical is a non-negative integer.
+    symmetry is the index of the symmetry that turns bits into canonical.
+    """
+    tables=get_symmetry_tables(size)
+    canonical=bits
+    symmetry=0
+    for k in range(1, len(tables)):
+        new_bits=transform_bits(bits, tables[k])
+        if new_bits<canonical:
+            canonical=new_bits
+            symmetry=k
+    return canonical, symmetry
+
+def transform_solution(solution, perm):
+    """
+    This function maps the moves of a solution through a symmetry.
+    Arguments: solution is an array of tuples of integers.
+    perm is an array of integers as returned by get_symmetries.
+    Return value: an array of tuples of integers.
+    """
+    return [(perm[move[0]], perm[move[1]], perm[move[2]]) for move in solution]
+
+class TranspositionTable:
+    """
+    This class caches the number of solutions from board states that have
+    already been searched, so states reached through different move orders
+    are only searched once. If the board size is given, states are stored by
+    their canonical form, so symmetric states also share an entry. The table
+    holds at most max_size entries; the oldest entry is evicted when it is
+    full.
+    """
+    def __init__(self, max_size=1000000, size=None):
+        """
+        The initializer sets the maximum size and creates an empty table.
+        Arguments: max_size is a positive integer.
+        size is the number of positions on the board, or None to store
+        states without canonicalizing them.
+        """
+        self.max_size=max_size
+        self.size=size
+        self.table={}
+    def get_key(self, bits):
+        """
+        This function gets the key a board state is stored under.
+        Argument: bits is a non-negative integer.
+        Return value: a non-negative integer.
+        """
+        if self.size is None:
+            return bits
+        return canonicalize_bits(bits, self.size)[0]
+    def get(self, bits):
+        """
+        This function looks up the number of solutions from a board state.
+        Argument: bits is a non-negative integer.
+        Return value: an integer, or None if the state isn't in the table.
+        """
+        return self.table.get(self.get_key(bits))
+    def put(self, bits, count):
+        """
+        This function records the number of solutions from a board state. A
+        count of 0 means the state is unsolvable.
+        Arguments: bits is a non-negative integer.
+        count is a non-negative integer.
+        """
+        key=self.get_key(bits)
+        if key not in self.table and len(self.table)>=self.max_size:
+            del self.table[next(iter(self.table))]  # evict oldest entry
+        self.table[key]=count
+
+def is_solved_bits(bits):
+    """
+    This function checks whether exactly one peg is left on a bitboard.
+    Argument: bits is a non-negative integer.
+    Return value: a Boolean
+    """
+    return bits!=0 and bits&(bits-1)==0
+
+def cb_all_bits(bits, hole_moves, table):
+    """
+    This function gets all possible solutions for a bitboard. It is the
+    bitboard version of cb_all. States already known to be unsolvable are
+    skipped.
+    Arguments: bits is a non-negative integer.
+    hole_moves is a 2D array as returned by get_hole_index.
+    table is a TranspositionTable.
     Return value: solutions is a 2D array of tuples of integers.
     """
-    total=0
-    for i in encoding:
-        total+=int(i)
-    if total==1:  # only one position has a peg, meaning board is solved
-        return [[]]  # base case; returns 2D array to be built off of
+    if is_solved_bits(bits):
+        return [[]]
+    if table.get(bits)==0:  # already known to have no solutions
+        return []
     solutions=[]
-    moves=get_moves(encoding)
-    for move in moves:
-        new_encoding=get_new_encoding(move, encoding)  # hypothetical new state
-        histories=cb_all(new_encoding)  # all paths leading to solved state
+    for move_mask in get_moves_bits(bits, hole_moves):
+        histories=cb_all_bits(get_new_bits(move_mask, bits), hole_moves, table)
         for history in histories:
-            if history!=None:  # add move to beginning of every valid solution
-                solutions.append([move]+history)
+            solutions.append([move_mask[0]]+history)
+    table.put(bits, len(solutions))
     return solutions
 
-def cb_one(encoding):
+def cb_one_bits(bits, hole_moves, table):
+    """
+    This function gets the first solution for a bitboard, stopping the search
+    as soon as one is found.
+    Arguments: bits is a non-negative integer.
+    hole_moves is a 2D array as returned by get_hole_index.
+    table is a TranspositionTable.
+    Return value: an array of tuples of integers, or None if there is no
+    solution.
+    """
+    if is_solved_bits(bits):
+        return []
+    if table.get(bits)==0:  # already known to have no solutions
+        return None
+    for move_mask in get_moves_bits(bits, hole_moves):
+        history=cb_one_bits(get_new_bits(move_mask, bits), hole_moves, table)
+        if history is not None:  # stop at the first solution
+            return [move_mask[0]]+history
+    table.put(bits, 0)  # every move was tried, so the state is unsolvable
+    return None
+
+def cb_count_bits(bits, hole_moves, table):
+    """
+    This function counts the solutions for a bitboard without building any
+    of them, reusing the counts of states that have already been searched.
+    Arguments: bits is a non-negative integer.
+    hole_moves is a 2D array as returned by get_hole_index.
+    table is a TranspositionTable.
+    Return value: count is a non-negative integer.
+    """
+    if is_solved_bits(bits):
+        return 1
+    count=table.get(bits)
+    if count is not None:
+        return count
+    count=0
+    for move_mask in get_moves_bits(bits, hole_moves):
+        count+=cb_count_bits(get_new_bits(move_mask, bits), hole_moves, table)
+    table.put(bits, count)
+    return count
+
+def iter_solutions_bits(bits, hole_moves, table):
+    """
+    This function generates the solutions for a bitboard one at a time, in
+    the same order as cb_all_bits. The search uses an explicit stack and a
+    single move path, so no lists are built for partial solutions.
+    Arguments: bits is a non-negative integer.
+    hole_moves is a 2D array as returned by get_hole_index.
+    table is a TranspositionTable.
+    Yields: arrays of tuples of integers.
+    """
+    if is_solved_bits(bits):
+        yield []
+        return
+    if table.get(bits)==0:  # already known to have no solutions
+        return
+    path=[]  # moves leading to the state on top of the stack
+    # each frame holds a state, its moves, the next move to try and the
+    # number of solutions found from it so far
+    stack=[[bits, get_moves_bits(bits, hole_moves), 0, 0]]
+    while stack:
+        frame=stack[-1]
+        if frame[2]==len(frame[1]):  # every move from this state was tried
+            stack.pop()
+            table.put(frame[0], frame[3])
+            if stack:  # pass the count up and undo the move into this state
+                stack[-1][3]+=frame[3]
+                path.pop()
+            continue
+        move_mask=frame[1][frame[2]]
+        frame[2]+=1
+        new_bits=get_new_bits(move_mask, frame[0])
+        if is_solved_bits(new_bits):
+            frame[3]+=1
+            yield path+[move_mask[0]]
+        elif table.get(new_bits)!=0:  # skip states known to be unsolvable
+            path.append(move_mask[0])
+            stack.append([new_bits, get_moves_bits(new_bits, hole_moves), 0, 0])
+
+def iter_solutions(encoding, table=None):
+    """
+    This function generates all possible solutions given an initial board
+    state, one at a time, so callers can stream them or stop early without
+    holding every solution in memory.
+    Arguments: encoding is a string of 1 and 0 characters.
+    table is an optional TranspositionTable to share between calls.
+    Yields: arrays of tuples of integers.
+    """
+    if table is None:
+        table=TranspositionTable()
+    hole_moves=get_move_tables(len(encoding))
+    yield from iter_solutions_bits(encoding_to_bits(encoding), hole_moves,
+                                   table)
+
+def cb_all(encoding, table=None):
+    """
+    This function gets all possible solutions given an initial board state and
+    returns them as lists of moves to get from the starting condition to a
+    solved board. The search itself is done on a bitboard.
+    Arguments: encoding is a string of 1 and 0 characters.
+    table is an optional TranspositionTable to share between calls.
+    Return value: solutions is a 2D array of tuples of integers.
+    """
+    if table is None:  # canonicalizing every node costs more than it saves
+        table=TranspositionTable()  # when every solution is built
+    hole_moves=get_move_tables(len(encoding))
+    return cb_all_bits(encoding_to_bits(encoding), hole_moves, table)
+
+def cb_one(encoding, table=None):
     """
     This function gets one possible solution given an initial board state and
     returns it as a list of moves to get from the starting condition to a
     solved board.
-    Argument: encoding is a string of 1 and 0 characters.
-    Return value: an array of tuples of integers.
+    Arguments: encoding is a string of 1 and 0 characters.
+    table is an optional TranspositionTable to share between calls.
+    Return value: an array of tuples of integers, or None if there is no
+    solution.
     """
-    solutions=cb_all(encoding)
-    if solutions==[]:  # no solutions
-        return None
-    return solutions[0]
+    if table is None:
+        table=TranspositionTable(size=len(encoding))
+    hole_moves=get_move_tables(len(encoding))
+    return cb_one_bits(encoding_to_bits(encoding), hole_moves, table)
+
+def cb_count(encoding, table=None):
+    """
+    This function counts all possible solutions given an initial board state.
+    Arguments: encoding is a string of 1 and 0 characters.
+    table is an optional TranspositionTable to share between calls.
+    Return value: a non-negative integer.
+    """
+    if table is None:
+        table=TranspositionTable(size=len(encoding))
+    hole_moves=get_move_tables(len(encoding))
+    return cb_count_bits(encoding_to_bits(encoding), hole_moves, table)
+
+def cb_all_starts(size=15, table=None):
+    """
+    This function gets all possible solutions for every starting board with
+    a single empty position. Symmetric starting boards are only solved once;
+    their solutions are mapped back to each board's own orientation.
+    Arguments: size is the number of positions on the board.
+    table is an optional TranspositionTable to share between calls.
+    Return value: results is a dictionary mapping encoding strings to 2D
+    arrays of tuples of integers.
+    """
+    if table is None:
+        table=TranspositionTable()
+    hole_moves=get_move_tables(size)
+    symmetries=get_symmetries(size)
+    canonical_solutions={}
+    results={}
+    for i in range(size):
+        encoding="1"*i+"0"+"1"*(size-i-1)
+        canonical, symmetry=canonicalize_bits(encoding_to_bits(encoding), size)
+        if canonical not in canonical_solutions:  # first board of its kind
+            canonical_solutions[canonical]=cb_all_bits(canonical, hole_moves,
+                                                       table)
+        inverse=[0]*size  # undoes the symmetry that gave the canonical board
+        for j in range(size):
+            inverse[symmetries[symmetry][j]]=j
+        results[encoding]=[transform_solution(solution, inverse)
+                           for solution in canonical_solutions[canonical]]
+    return results
+
+def get_starts(size=15, holes=1):
+    """
+    This function gets every starting board with a certain number of empty
+    positions.
+    Arguments: size is the number of positions on the board.
+    holes is the number of empty positions.
+    Return value: starts is an array of encoding strings.
+    """
+    starts=[]
+    for empty in itertools.combinations(range(size), holes):
+        encoding=["1"]*size
+        for i in empty:
+            encoding[i]="0"
+        starts.append("".join(encoding))
+    return starts
+
+def get_subtrees(bits, hole_moves, depth):
+    """
+    This function splits the search tree of a bitboard into the subtrees
+    found after making depth moves, in the order the serial solver visits
+    them. Boards that are solved or stuck before depth moves end their own
+    branch.
+    Arguments: bits is a non-negative integer.
+    hole_moves is a 2D array as returned by get_hole_index.
+    depth is a non-negative integer.
+    Return value: subtrees is an array of (prefix, bits) tuples, where prefix
+    is the array of moves leading to the subtree's board.
+    """
+    if depth==0 or is_solved_bits(bits):
+        return [([], bits)]
+    subtrees=[]
+    for move_mask in get_moves_bits(bits, hole_moves):
+        new_bits=get_new_bits(move_mask, bits)
+        for prefix, sub_bits in get_subtrees(new_bits, hole_moves, depth-1):
+            subtrees.append(([move_mask[0]]+prefix, sub_bits))
+    return subtrees
+
+def init_worker(max_size):
+    """
+    This function sets up the transposition tables of a batch worker
+    process. The process keeps one table per board size, which is shared by
+    every subtree of that size it solves; boards of different sizes can have
+    the same bitboard but different moves, so they can't share a table.
+    Argument: max_size is a positive integer.
+    """
+    global WORKER_MAX_SIZE
+    WORKER_TABLES.clear()
+    WORKER_MAX_SIZE=max_size
+
+def get_worker_table(size):
+    """
+    This function gets the transposition table a batch worker process uses
+    for boards with a certain number of positions, making it if needed.
+    Argument: size is the number of positions on the board.
+    Return value: table is a TranspositionTable.
+    """
+    if size not in WORKER_TABLES:
+        WORKER_TABLES[size]=TranspositionTable(WORKER_MAX_SIZE)
+    return WORKER_TABLES[size]
+
+def solve_subtree(bits, size, count_only):
+    """
+    This function solves one subtree of a batch in a worker process.
+    Arguments: bits is a non-negative integer.
+    size is the number of positions on the board.
+    count_only is a Boolean; if it is True only solutions are counted.
+    Return value: either a non-negative integer or a 2D array of tuples of
+    integers.
+    """
+    hole_moves=get_move_tables(size)
+    table=get_worker_table(size)
+    if count_only:
+        return cb_count_bits(bits, hole_moves, table)
+    return cb_all_bits(bits, hole_moves, table)
+
+def cb_batch(encodings, depth=1, workers=None, count_only=False,
+             ordered=True, max_size=1000000):
+    """
+    This function solves a batch of starting boards on a process pool. Each
+    board's search tree is split into subtrees after depth moves, the
+    subtrees are solved in parallel, and the results are merged per board.
+    Arguments: encodings is an array of strings of 1 and 0 characters.
+    depth is the number of moves to make before splitting.
+    workers is the number of processes, or None for one per CPU.
+    count_only is a Boolean; if it is True only solutions are counted.
+    ordered is a Boolean; if it is True solutions come out in the same order
+    as cb_all, otherwise in the order subtrees finish.
+    max_size is the size of each worker's transposition table.
+    Return value: results is a dictionary mapping each encoding to its number
+    of solutions (if count_only) or to a 2D array of tuples of integers.
+    Repeated encodings are only solved once.
+    """
+    results={}
+    with concurrent.futures.ProcessPoolExecutor(workers,
+                                                initializer=init_worker,
+                                                initargs=(max_size,)) as pool:
+        futures={}  # maps each future to its board and the subtree's prefix
+        for encoding in dict.fromkeys(encodings):  # drop repeats, keep order
+            results[encoding]=0 if count_only else []
+            hole_moves=get_move_tables(len(encoding))
+            bits=encoding_to_bits(encoding)
+            for prefix, sub_bits in get_subtrees(bits, hole_moves, depth):
+                future=pool.submit(solve_subtree, sub_bits, len(encoding),
+                                   count_only)
+                futures[future]=(encoding, prefix)
+        if ordered:  # futures were submitted in the serial search order
+            done=futures
+        else:
+            done=concurrent.futures.as_completed(futures)
+        for future in done:
+            encoding, prefix=futures[future]
+            if count_only:
+                results[encoding]+=future.result()
+            else:
+                for solution in future.result():
+                    results[encoding].append(prefix+solution)
+    return results
+
+get_move_tables(15)  # build the tables for the standard board at import
+get_symmetry_tables(15)
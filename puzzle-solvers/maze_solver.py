@@ -13,8 +13,23 @@ See the file maze_example_file for an example.
 The user will see different outputs depending on which command they choose;
 the default (if they press enter instead of entering a command) is to display 
 a solved version of the maze, where the path is drawn out with dots.
+
+The search strategy can be given as a command line argument: bfs (the
+default), astar or bidir. The number of cells expanded and the time the
+search took are displayed on stderr.
+
+To answer many start/end queries against the same maze, import this file and
+use MazeService with the grid returned by load_grid.
 """
+import heapq
+import mmap
 import sys
+import time
+from array import array
+from collections import deque
+
+SPACE=ord(" ")  # grid value of squares that aren't open
+CHUNK_SIZE=1<<24  # bytes of the maze file to validate at a time
 
 class TreeNode:
     """
@@ -35,58 +50,115 @@ class TreeNode:
         """
         self.children.append(TreeNode(val))
 
-def update_openings(openings, char, j, i):
+def check_chars(data):
     """
-    This function updates the record of openings to the maze with a
-    coordinate specifying the location of the opening, or throws in error if
-    the number of openings doesn't match the expected value.
-    Arguments: openings is an array of two tuples.
-    char is a string, either "S" or "E".
-    j is a non-negative integer.
-    i is a non-negative integer.
-    Return values: openings is an array of two tuples.
+    This function checks that a maze file only contains valid characters,
+    looking at large chunks of the file at a time.
+    Argument: data is a bytes-like object with the contents of the file.
     """
-    if char=="S":  # start position
-        if openings[0]==tuple():  # there isn't already a start position
-            openings[0]=(j, i)
-        else:
-            print("ERROR: The map has more than one START position")
-            sys.exit(0)
-    elif char=="E":  # end position
-        if openings[1]==tuple():  # there isn't already an end position
-            openings[1]=(j, i)
-        else:
-            print("ERROR: The map has more than one END position")
+    for start in range(0, len(data), CHUNK_SIZE):
+        chunk=data[start:start+CHUNK_SIZE]
+        if chunk.translate(None, b"# SE\r\n")!=b"":  # anything left over
+            print("ERROR: Invalid character in the map")  # is invalid
             sys.exit(0)
-    return openings
-        
-def get_coords(file):
+
+def get_rows(data):
     """
-    This function retrieves the coordinates for the paths and start and end
-    positions in a maze text file.
-    Argument: file is a file type object.
-    Return values: paths is an array of tuples.
-    openings is an array of tuples.
+    This function goes through the rows of a maze file.
+    Argument: data is a bytes-like object with the contents of the file.
+    Return value: a generator of bytes objects, one per row, without
+    trailing spaces or line endings.
     """
-    paths=[]
-    openings=[tuple(), tuple()]
-    i=0  # keep track of row number
-    for line in file:
-        line=line.rstrip()  # remove newlines
-        for j in range(len(line)):
-            if line[j]=="#":  # part of path
-                paths.append((j, i))
-            elif line[j] in "SE":  # start or end
-                openings=update_openings(openings, line[j], j, i)
-            elif line[j]!=" ":  # only other valid character is a space
-                print("ERROR: Invalid character in the map")
-                sys.exit(0)
-        i+=1
-    if openings[0]==tuple() or openings[1]==tuple():  # no start or end
+    start=0
+    while start<len(data):
+        end=data.find(b"\n", start)
+        if end==-1:  # last line has no newline
+            end=len(data)
+        yield data[start:end].rstrip()  # remove trailing spaces and \r
+        start=end+1
+
+def make_grid(data):
+    """
+    This function copies the rows of a maze file into a flat grid with one
+    byte per cell, where cell (j, i) is at index i*width+j. Rows shorter than
+    the widest row are padded with spaces. A first pass over the file finds
+    the width and height, so each row is copied only once.
+    Argument: data is a bytes-like object with the contents of the file.
+    Return values: grid is a bytearray of map characters.
+    width is a non-negative integer.
+    height is a non-negative integer.
+    """
+    width=0
+    height=0  # number of rows up to the last one with any cells
+    for i, line in enumerate(get_rows(data)):
+        if line!=b"":
+            width=max(width, len(line))
+            height=i+1
+    grid=bytearray(b" ")*(width*height)
+    for i, line in enumerate(get_rows(data)):
+        if i==height:  # only blank rows are left
+            break
+        grid[i*width:i*width+len(line)]=line
+    return grid, width, height
+
+def find_openings(grid, width):
+    """
+    This function finds the start and end positions of a maze grid, or ends
+    the program with an error message if there isn't exactly one of each.
+    Arguments: grid is a bytearray of map characters.
+    width is a non-negative integer.
+    Return value: openings is an array of two tuples.
+    """
+    if grid.count(b"S")>1:
+        print("ERROR: The map has more than one START position")
+        sys.exit(0)
+    if grid.count(b"E")>1:
+        print("ERROR: The map has more than one END position")
+        sys.exit(0)
+    start=grid.find(b"S")
+    end=grid.find(b"E")
+    if start==-1 or end==-1:  # no start or end
         print("ERROR: Every map needs exactly one START and exactly one END "\
               "position")
         sys.exit(0)
-    return paths, openings
+    return [(start%width, start//width), (end%width, end//width)]
+
+def load_grid(file):
+    """
+    This function reads a maze file into a flat grid. The file is memory
+    mapped, so it is scanned in place instead of being read line by line.
+    Argument: file is a file type object opened in binary mode.
+    Return values: grid is a bytearray of map characters.
+    width is a non-negative integer.
+    height is a non-negative integer.
+    openings is an array of tuples.
+    """
+    try:
+        data=mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    except ValueError:  # empty files can't be mapped
+        data=b""
+    check_chars(data)
+    grid, width, height=make_grid(data)
+    if data:
+        data.close()
+    openings=find_openings(grid, width)
+    return grid, width, height, openings
+
+def get_cells(grid, width, height):
+    """
+    This function gets the coordinates of every cell of a maze grid that
+    isn't a space.
+    Arguments: grid is a bytearray of map characters.
+    width is a non-negative integer.
+    height is a non-negative integer.
+    Return value: cells is a set of tuples.
+    """
+    cells=set()
+    for i in range(height):
+        for j in range(width):
+            if grid[i*width+j]!=SPACE:
+                cells.add((j, i))
+    return cells
 
 def make_tree(root, cells):
     """
@@ -131,71 +203,361 @@ def find_solution(root, end):
             solution=[root.val]+prev_path
     return solution
 
-def get_size(cells):
+def get_neighbors(grid, width, index):
     """
-    This function gets the dimensions of a maze.
-    Argument: cells is a set of tuples representing the cells of the maze.
-    Return values: width is a non-negative integer.
-    height is a non-negative integer.
+    This function gets the open cells next to a cell of the grid.
+    Arguments: grid is a bytearray of map characters.
+    width is a non-negative integer.
+    index is the grid index of a cell.
+    Return value: neighbors is an array of (direction, index) tuples, where
+    direction is the index into the offsets used to reach the neighbor.
     """
-    sorted_cells=sorted(list(cells))  # makes sorted list out of set
-    width=sorted_cells[-1][0]+1  # largest width will be at the end
-    for i in range(len(sorted_cells)):
-        sorted_cells[i]=(sorted_cells[i][1], sorted_cells[i][0])  # swap coords
-    sorted_cells=sorted(sorted_cells)
-    height=sorted_cells[-1][0]+1  # largest height will now be at the end
-    return width, height
+    neighbors=[]
+    col=index%width
+    # go in order of up, down, left, right
+    for direction, neighbor in ((1, index-width), (2, index+width),
+                                (3, index-1), (4, index+1)):
+        if direction==3 and col==0 or direction==4 and col==width-1:
+            continue  # don't wrap around to another row
+        if 0<=neighbor<len(grid) and grid[neighbor]!=SPACE:
+            neighbors.append((direction, neighbor))
+    return neighbors
 
-def init_grid(width, height):
+def trace_path(came_from, offsets, width, start_index, index):
     """
-    This function initializes a grid of a certain size to have all its slots
-    filled with spaces.
-    Arguments: width is a non-negative integer.
-    height is a non-negative integer.
-    Return value: grid is a 2D array of strings.
+    This function walks back through the directions recorded by a search,
+    from a cell to the search's starting cell.
+    Arguments: came_from is a bytearray of indices into offsets.
+    offsets is a tuple of index offsets for each direction.
+    width is a non-negative integer.
+    start_index is the grid index the search started from.
+    index is the grid index to walk back from.
+    Return value: path is an array of tuples representing coordinates, from
+    index back to start_index.
     """
-    grid=[]
-    for i in range(height):
-        row=[]  # make grid row by row
-        for j in range(width):
-            row.append(" ")
-        grid.append(row)
-    return grid
+    path=[]
+    while index!=start_index:
+        path.append((index%width, index//width))
+        index-=offsets[came_from[index]]
+    path.append((index%width, index//width))
+    return path
 
-def make_map(grid, cells, solution):
+def bfs_solution(grid, width, start, end):
     """
-    This function fills a grid with map elements, based on information about
-    the coordinates of a maze.
-    Arguments: grid is a 2D array.
-    cells is a set of tuples representing coordinates.
-    soltuion is an array of tuples representing coordinates.
+    This function finds the shortest path through a maze with an iterative
+    breadth first search over the flat grid. Each visited cell records the
+    direction it was reached from in a second bytearray, so the path can be
+    read back from the end once it is found.
+    Arguments: grid is a bytearray of map characters.
+    width is a non-negative integer.
+    start is a tuple of integers representing the start position.
+    end is a tuple of integers representing the end position.
+    Return values: solution is an array of tuples, representing the
+    coordinates of the path from start to end, or an empty array if there is
+    no path.
+    expanded is the number of cells the search expanded.
     """
-    for cell in cells:
-        i, j=cell[1], cell[0]
-        grid[i][j]="#"  # set all maze cells to paths (#) initially
-    for coord in solution:
-        i, j=coord[1], coord[0]
-        grid[i][j]="."  # overwrite cells in the solution as dots
-    start_i, start_j=solution[0][1], solution[0][0]
-    end_i, end_j=solution[-1][1], solution[-1][0]
-    grid[start_i][start_j]="S"  # overwrite start and end positions
-    grid[end_i][end_j]="E"
+    offsets=(0, -width, width, -1, 1)  # none, up, down, left, right
+    came_from=bytearray(len(grid))  # index into offsets; 0 means unvisited
+    start_index=start[1]*width+start[0]
+    end_index=end[1]*width+end[0]
+    came_from[start_index]=1  # marks the start as visited
+    queue=deque([start_index])
+    expanded=0
+    while queue:
+        index=queue.popleft()
+        if index==end_index:
+            solution=trace_path(came_from, offsets, width, start_index, index)
+            solution.reverse()
+            return solution, expanded
+        expanded+=1
+        for direction, neighbor in get_neighbors(grid, width, index):
+            if came_from[neighbor]==0:  # not visited yet
+                came_from[neighbor]=direction
+                queue.append(neighbor)
+    return [], expanded  # end was never reached
+
+def astar_solution(grid, width, start, end):
+    """
+    This function finds the shortest path through a maze with an A* search,
+    which expands cells in order of their distance from the start plus their
+    Manhattan distance to the end.
+    Arguments: grid is a bytearray of map characters.
+    width is a non-negative integer.
+    start is a tuple of integers representing the start position.
+    end is a tuple of integers representing the end position.
+    Return values: solution is an array of tuples, representing the
+    coordinates of the path from start to end, or an empty array if there is
+    no path.
+    expanded is the number of cells the search expanded.
+    """
+    offsets=(0, -width, width, -1, 1)  # none, up, down, left, right
+    came_from=bytearray(len(grid))  # index into offsets; 0 means unvisited
+    start_index=start[1]*width+start[0]
+    end_index=end[1]*width+end[0]
+    came_from[start_index]=1  # marks the start as visited
+    distances={start_index: 0}  # shortest known distance from the start
+    closed=bytearray(len(grid))  # 1 once a cell has been expanded
+    # ties between equal estimates go to the cell furthest from the start
+    heap=[(abs(start[0]-end[0])+abs(start[1]-end[1]), 0, start_index)]
+    expanded=0
+    while heap:
+        estimate, distance, index=heapq.heappop(heap)
+        distance=-distance
+        if closed[index]:  # stale entry for a cell that was already expanded
+            continue
+        if index==end_index:
+            solution=trace_path(came_from, offsets, width, start_index, index)
+            solution.reverse()
+            return solution, expanded
+        closed[index]=1
+        expanded+=1
+        for direction, neighbor in get_neighbors(grid, width, index):
+            if closed[neighbor]:
+                continue
+            if neighbor not in distances or distance+1<distances[neighbor]:
+                distances[neighbor]=distance+1
+                came_from[neighbor]=direction
+                j, i=neighbor%width, neighbor//width
+                estimate=distance+1+abs(j-end[0])+abs(i-end[1])
+                heapq.heappush(heap, (estimate, -distance-1, neighbor))
+    return [], expanded  # end was never reached
+
+def bidirectional_solution(grid, width, start, end):
+    """
+    This function finds the shortest path through a maze with two breadth
+    first searches, one from the start and one from the end. The smaller
+    frontier is expanded one full layer at a time until the searches meet.
+    Arguments: grid is a bytearray of map characters.
+    width is a non-negative integer.
+    start is a tuple of integers representing the start position.
+    end is a tuple of integers representing the end position.
+    Return values: solution is an array of tuples, representing the
+    coordinates of the path from start to end, or an empty array if there is
+    no path.
+    expanded is the number of cells the searches expanded.
+    """
+    offsets=(0, -width, width, -1, 1)  # none, up, down, left, right
+    start_index=start[1]*width+start[0]
+    end_index=end[1]*width+end[0]
+    if start_index==end_index:
+        return [start], 0
+    forward=bytearray(len(grid))  # directions recorded by each search
+    backward=bytearray(len(grid))
+    forward[start_index]=1  # marks the start and end as visited
+    backward[end_index]=1
+    forward_queue=deque([start_index])
+    backward_queue=deque([end_index])
+    expanded=0
+    while forward_queue and backward_queue:
+        if len(forward_queue)<=len(backward_queue):
+            queue, came_from, other=forward_queue, forward, backward
+        else:
+            queue, came_from, other=backward_queue, backward, forward
+        for k in range(len(queue)):  # expand one full layer
+            index=queue.popleft()
+            expanded+=1
+            for direction, neighbor in get_neighbors(grid, width, index):
+                if came_from[neighbor]!=0:  # already visited by this search
+                    continue
+                came_from[neighbor]=direction
+                if other[neighbor]!=0:  # the two searches meet here
+                    solution=trace_path(forward, offsets, width, start_index,
+                                        neighbor)
+                    solution.reverse()
+                    solution+=trace_path(backward, offsets, width, end_index,
+                                         neighbor)[1:]
+                    return solution, expanded
+                queue.append(neighbor)
+    return [], expanded  # the searches never met
+
+class DistanceField:
+    """
+    This class holds the result of a full breadth first search from one
+    source cell: the distance to every reachable cell and the direction each
+    cell was reached from. Paths from the source to any target can then be
+    read off in time proportional to their length.
+    """
+    def __init__(self, grid, width, source):
+        """
+        The initializer runs the breadth first search from the source.
+        Arguments: grid is a bytearray of map characters.
+        width is a non-negative integer.
+        source is a tuple of integers representing a position.
+        """
+        self.width=width
+        self.offsets=(0, -width, width, -1, 1)  # none, up, down, left, right
+        self.source_index=source[1]*width+source[0]
+        self.came_from=bytearray(len(grid))  # 0 means unreachable
+        self.distances=array("i", [-1])*len(grid)  # -1 means unreachable
+        self.came_from[self.source_index]=1  # marks the source as visited
+        self.distances[self.source_index]=0
+        queue=deque([self.source_index])
+        while queue:
+            index=queue.popleft()
+            for direction, neighbor in get_neighbors(grid, width, index):
+                if self.came_from[neighbor]==0:  # not visited yet
+                    self.came_from[neighbor]=direction
+                    self.distances[neighbor]=self.distances[index]+1
+                    queue.append(neighbor)
+    def distance(self, target):
+        """
+        This function gets the length of the shortest path to a target.
+        Argument: target is a tuple of integers representing a position.
+        Return value: an integer, or -1 if the target can't be reached.
+        """
+        return self.distances[target[1]*self.width+target[0]]
+    def path(self, target):
+        """
+        This function gets the shortest path from the source to a target.
+        Argument: target is a tuple of integers representing a position.
+        Return value: path is an array of tuples representing coordinates,
+        or an empty array if the target can't be reached.
+        """
+        index=target[1]*self.width+target[0]
+        if self.came_from[index]==0:
+            return []
+        path=trace_path(self.came_from, self.offsets, self.width,
+                        self.source_index, index)
+        path.reverse()
+        return path
+
+class MazeService:
+    """
+    This class answers many start/end queries against one maze. Distance
+    fields are kept for the most recently used sources, and every cell is
+    labelled with its connected component, so queries between cells that
+    aren't connected are rejected without searching.
+    """
+    def __init__(self, grid, width, height, max_fields=8):
+        """
+        The initializer stores the maze; fields and labels are computed the
+        first time they're needed.
+        Arguments: grid is a bytearray of map characters.
+        width is a non-negative integer.
+        height is a non-negative integer.
+        max_fields is the number of distance fields to keep.
+        """
+        self.grid=grid
+        self.width=width
+        self.height=height
+        self.max_fields=max_fields
+        self.fields={}  # maps sources to distance fields, oldest first
+        self.labels=None
+    def get_field(self, source):
+        """
+        This function gets the distance field for a source, computing it if
+        it isn't already kept.
+        Argument: source is a tuple of integers representing a position.
+        Return value: a DistanceField.
+        """
+        if source in self.fields:
+            self.fields[source]=self.fields.pop(source)  # now most recent
+        else:
+            if len(self.fields)>=self.max_fields:
+                del self.fields[next(iter(self.fields))]  # drop oldest field
+            self.fields[source]=DistanceField(self.grid, self.width, source)
+        return self.fields[source]
+    def get_labels(self):
+        """
+        This function labels every open cell with a number identifying its
+        connected component; walls are labelled 0.
+        Return value: labels is an array of integers, one per grid cell.
+        """
+        if self.labels is None:
+            self.labels=array("i", [0])*len(self.grid)
+            label=0
+            for index in range(len(self.grid)):
+                if self.grid[index]==SPACE or self.labels[index]!=0:
+                    continue
+                label+=1  # flood fill a new component
+                self.labels[index]=label
+                queue=deque([index])
+                while queue:
+                    cell=queue.popleft()
+                    for direction, neighbor in get_neighbors(self.grid,
+                                                             self.width, cell):
+                        if self.labels[neighbor]==0:
+                            self.labels[neighbor]=label
+                            queue.append(neighbor)
+        return self.labels
+    def connected(self, start, end):
+        """
+        This function checks whether there is any path between two cells.
+        Arguments: start is a tuple of integers representing a position.
+        end is a tuple of integers representing a position.
+        Return value: a Boolean
+        """
+        labels=self.get_labels()
+        start_label=labels[start[1]*self.width+start[0]]
+        return start_label!=0 and \
+            start_label==labels[end[1]*self.width+end[0]]
+    def distance(self, start, end):
+        """
+        This function gets the length of the shortest path between two cells.
+        Arguments: start is a tuple of integers representing a position.
+        end is a tuple of integers representing a position.
+        Return value: an integer, or -1 if there is no path.
+        """
+        if not self.connected(start, end):
+            return -1
+        return self.get_field(start).distance(end)
+    def path(self, start, end):
+        """
+        This function gets the shortest path between two cells.
+        Arguments: start is a tuple of integers representing a position.
+        end is a tuple of integers representing a position.
+        Return value: an array of tuples representing coordinates, or an
+        empty array if there is no path.
+        """
+        if not self.connected(start, end):
+            return []
+        return self.get_field(start).path(end)
+
+SEARCHES={"bfs": bfs_solution, "astar": astar_solution,
+          "bidir": bidirectional_solution}
+
+def make_map(grid, width, solution):
+    """
+    This function makes a copy of the maze grid with the solution drawn on
+    it.
+    Arguments: grid is a bytearray of map characters.
+    width is a non-negative integer.
+    solution is an array of tuples representing coordinates.
+    Return value: map_grid is a bytearray of map characters.
+    """
+    map_grid=bytearray(grid)
+    for coord in solution[1:-1]:  # start and end keep their S and E
+        map_grid[coord[1]*width+coord[0]]=ord(".")  # solution cells as dots
+    return map_grid
     
-def dump_cells(cells, openings):
+def write_output(data):
+    """
+    This function writes bytes to the console in one call, after anything
+    already printed.
+    Argument: data is a bytes-like object.
+    """
+    sys.stdout.flush()  # keep the order of earlier print calls
+    sys.stdout.buffer.write(data)
+    sys.stdout.buffer.flush()
+
+def dump_cells(grid, width, height, openings):
     """
     This function displays the coordinates present in the maze to the console.
-    Arguments: cells is a set of tuples representing coordinates.
+    The lines for each column are built together and written in one call.
+    Arguments: grid is a bytearray of map characters.
+    width is a non-negative integer.
+    height is a non-negative integer.
     openings is an array of tuples representing coordinates.
     """
-    sorted_cells=sorted(list(cells))
-    print("DUMPING OUT ALL CELLS FROM THE MAZE:")
-    for cell in sorted_cells:
-        disp="  "+str(cell)
-        if cell==openings[0]:  # mark the start and end cells
-            disp+="    START"
-        elif cell==openings[1]:
-            disp+="    END"
-        print(disp)
+    marks={openings[0]: "    START", openings[1]: "    END"}
+    write_output(b"DUMPING OUT ALL CELLS FROM THE MAZE:\n")
+    for j in range(width):  # cells are sorted by x, then y
+        column=grid[j::width]
+        lines=["  (%d, %d)%s\n" % (j, i, marks.get((j, i), ""))
+               for i in range(height) if column[i]!=SPACE]
+        if lines:
+            write_output("".join(lines).encode())
     
 def print_tree(root, offset="  "):
     """
@@ -220,13 +582,14 @@ def dump_tree(root):
 def dump_solution(solution):
     """
     This function displays the coordinates representing the path of the
-    solution to the maze to the console.
+    solution to the maze to the console, in one buffered write.
     Argument: solution is an array of tuples representing coordinates in the 
     maze.
     """
-    print("PATH OF THE SOLUTION:")
+    lines=["PATH OF THE SOLUTION:\n"]
     for coord in solution:
-        print("  "+str(coord))  # includes offset for each coordinate
+        lines.append("  (%d, %d)\n" % coord)  # offset for each coordinate
+    write_output("".join(lines).encode())
 
 def dump_size(width, height):
     """
@@ -239,54 +602,86 @@ def dump_size(width, height):
     print("  wid:", width)
     print("  hei:", height)
 
-def disp_map(grid):
+def disp_map(map_grid, width, height):
     """
-    This function uses a 2D array of map characters to display a map to the
-    console.
-    Argument: grid is a 2D array.
+    This function uses a grid of map characters to display a map to the
+    console. The whole map is joined into one block of bytes and written in
+    a single call.
+    Arguments: map_grid is a bytearray of map characters.
+    width is a non-negative integer.
+    height is a non-negative integer.
     """
-    print("SOLUTION:")
-    for row in grid:
-        print("".join(row))  # prints entire row
+    rows=[map_grid[i*width:(i+1)*width] for i in range(height)]
+    write_output(b"SOLUTION:\n"+b"\n".join(rows)+b"\n")
 
 def get_input():
     """
     This function gets input from the user and does error checking.
     Return values: command is a string.
-    paths is an array of tuples representing coordinates.
+    grid is a bytearray of map characters.
+    width is a non-negative integer.
+    height is a non-negative integer.
     openings is an array of tuples representing coordinates.
     """
     filename=input()
     try:
-        file=open(filename, "r")
+        file=open(filename, "rb")
     except:  # if fille doesn't exist
         print("ERROR: Could not open file: NO_SUCH_FILE")
         sys.exit(0)
-    paths, openings=get_coords(file)
+    grid, width, height, openings=load_grid(file)
+    file.close()
     command=input()
-    return command, paths, openings
+    return command, grid, width, height, openings
+
+def get_search():
+    """
+    This function gets the search strategy from the command line; the
+    default is a breadth first search.
+    Return value: search is a string, a key of SEARCHES.
+    """
+    search="bfs"
+    if len(sys.argv)>1:
+        search=sys.argv[1]
+    if search not in SEARCHES:
+        print("ERROR: Unrecognized search strategy, use one of: "+\
+              ", ".join(SEARCHES))
+        sys.exit(0)
+    return search
+
+def dump_stats(search, expanded, seconds):
+    """
+    This function displays information about a search to stderr, so it
+    doesn't mix with the output of the command.
+    Arguments: search is a string.
+    expanded is a non-negative integer.
+    seconds is a float.
+    """
+    print("SEARCH:", search, file=sys.stderr)
+    print("  expanded:", expanded, file=sys.stderr)
+    print("  time: %.6fs" % seconds, file=sys.stderr)
 
 def main():    
-    command, paths, openings=get_input()    
-    root=TreeNode(openings[0])  # root node represents start of maze
-    cells=set(paths+openings)
-    make_tree(root, cells.copy())  # make copy so it can be modified
-    solution=find_solution(root, openings[1])
-    width, height=get_size(cells)
-    grid=init_grid(width, height)
-    make_map(grid, cells, solution)
+    search=get_search()
+    command, grid, width, height, openings=get_input()    
+    start_time=time.perf_counter()
+    solution, expanded=SEARCHES[search](grid, width, openings[0], openings[1])
+    dump_stats(search, expanded, time.perf_counter()-start_time)
 
     if command=="dumpCells":
-        dump_cells(cells, openings)
+        dump_cells(grid, width, height, openings)
     elif command=="dumpTree":
+        root=TreeNode(openings[0])  # root node represents start of maze
+        make_tree(root, get_cells(grid, width, height))
         dump_tree(root)
     elif command=="dumpSolution":
         dump_solution(solution)
     elif command=="dumpSize":
         dump_size(width, height)
     elif command=="":
-        disp_map(grid)
+        disp_map(make_map(grid, width, solution), width, height)
     else:  # only valid commands are blank line or "dump..."
         print("ERROR: Unrecognized command NOT_A_VALID_COMMAND")
 
-main()
\ No newline at end of file
+if __name__=="__main__":
+    main()
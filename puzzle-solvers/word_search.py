@@ -15,9 +15,37 @@ See word_searcH_example_file for an example.
 The locations of each word will be displayed to the console as the word
 searcher finds them. Words can be horizontal, vertical, or diagonal; they can
 be spelled forwards or backwards.
+
+The search mode can be given as a command line argument: automaton (the
+default) searches for all the words in one pass, index searches for each word
+starting only from cells holding its first letter, numpy compares shifted
+copies of the grid against each word (NumPy must be installed), and scan
+searches for each word separately. With the --combined argument, all the
+found words are shown together on a single grid instead.
+
+Many puzzle files can be solved at once with
+    python word_search.py batch PATH [MODE] [WORKERS]
+where PATH is a directory or a glob pattern. The puzzles are solved across a
+pool of processes, and one line of JSON is written per puzzle with the
+positions of its words. The number of puzzles solved per second is displayed
+on stderr.
 """
 
+import concurrent.futures
+import glob
+import json
+import os
 import sys
+import time
+from collections import deque
+
+try:
+    import numpy as np
+except ImportError:  # only needed for the numpy search mode
+    np=None
+
+DIRECTIONS=[(-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0),
+            (1, 1)]  # (y_incr, x_incr) of the eight directions
 
 def get_file():
     """
@@ -88,7 +116,7 @@ def find_match(grid, word):
                         matches the word of interest so far.
                         """
                         if y>=0 and y<len(grid):  # make sure the search
-                            if x>=0 and x<len(grid[0]):  # won't go off grid
+                            if x>=0 and x<len(grid[y]):  # won't go off grid
                                 match+=grid[y][x]
                                 indices.append((y, x))
                                 y+=y_incr  # take a step in the selected
@@ -103,6 +131,278 @@ def find_match(grid, word):
                     indices=[]  # didn't find the word
     return indices  # return empty list if word not found
 
+def build_automaton(words):
+    """
+    This function builds an Aho-Corasick automaton for a list of words, so
+    all of them can be searched for in a single pass over a line of letters.
+    Argument: words is an array of strings of any length.
+    Return values: goto is an array of dictionaries mapping letters to
+    states. fail is an array of integers; fail[state] is the state to fall
+    back to when no transition matches. out is a 2D array; out[state] holds
+    the words that end at that state.
+    """
+    goto=[{}]
+    out=[[]]
+    for word in words:
+        if word=="":  # an empty word can't be found
+            continue
+        state=0
+        for letter in word:  # add the word to the trie
+            if letter not in goto[state]:
+                goto.append({})
+                out.append([])
+                goto[state][letter]=len(goto)-1
+            state=goto[state][letter]
+        if word not in out[state]:
+            out[state].append(word)
+    fail=[0]*len(goto)
+    queue=deque(goto[0].values())  # states one letter deep fall back to root
+    while queue:  # breadth first, so shorter states get their fail first
+        state=queue.popleft()
+        for letter, child in goto[state].items():
+            queue.append(child)
+            back=fail[state]
+            while back and letter not in goto[back]:
+                back=fail[back]
+            fail[child]=goto[back].get(letter, 0)
+            out[child]=out[child]+out[fail[child]]  # words ending in a suffix
+    return goto, fail, out
+
+def get_lines(grid, y_incr, x_incr):
+    """
+    This function gets the start of every line of the grid in a direction,
+    i.e. every cell whose previous cell in that direction is off the grid.
+    Rows may have different lengths, so a line can also start after a short
+    row.
+    Arguments: grid is a 2D array of one character strings.
+    y_incr and x_incr are -1, 0 or 1.
+    Return value: starts is an array of tuples of integers.
+    """
+    height=len(grid)
+    starts=[]
+    for i in range(height):
+        for j in range(len(grid[i])):
+            y=i-y_incr
+            x=j-x_incr
+            if y<0 or y>=height or x<0 or x>=len(grid[y]):
+                starts.append((i, j))
+    return starts
+
+def find_matches_automaton(grid, words):
+    """
+    This function finds every word in a 2D array of letters using one
+    Aho-Corasick automaton and a single pass over every row, column and
+    diagonal in both directions. If a word appears more than once, the match
+    find_match would find first is kept.
+    Arguments: grid is a 2D array of one character strings.
+    words is an array of strings of any length.
+    Return value: matches is a dictionary mapping each word to an array that
+    may be empty or contain tuples of integers.
+    """
+    goto, fail, out=build_automaton(words)
+    best={}  # maps each word to the (i, j, y_incr, x_incr) of its match
+    if grid!=[]:
+        height=len(grid)
+        for y_incr, x_incr in DIRECTIONS:
+            for i, j in get_lines(grid, y_incr, x_incr):
+                state=0
+                while 0<=i<height and 0<=j<len(grid[i]):  # walk the line
+                    letter=grid[i][j]
+                    while state and letter not in goto[state]:
+                        state=fail[state]
+                    state=goto[state].get(letter, 0)
+                    for word in out[state]:
+                        back=len(word)-1  # steps back to the first letter
+                        key=(i-back*y_incr, j-back*x_incr, y_incr, x_incr)
+                        if word not in best or key<best[word]:
+                            best[word]=key
+                    i+=y_incr
+                    j+=x_incr
+    matches={}
+    for word in words:
+        indices=[]
+        if word in best:
+            i, j, y_incr, x_incr=best[word]
+            for k in range(len(word)):
+                indices.append((i+k*y_incr, j+k*x_incr))
+        matches[word]=indices
+    return matches
+
+def make_letter_index(grid):
+    """
+    This function records where each letter appears in a 2D array of
+    letters, in row by row order.
+    Argument: grid is a 2D array of one character strings.
+    Return value: index is a dictionary mapping one character strings to
+    arrays of tuples of integers.
+    """
+    index={}
+    for i in range(len(grid)):
+        for j in range(len(grid[i])):
+            if grid[i][j] not in index:
+                index[grid[i][j]]=[]
+            index[grid[i][j]].append((i, j))
+    return index
+
+def find_match_indexed(grid, word, index):
+    """
+    This function determines whether a word is contained within a 2D array
+    of letters, like find_match, but only starts from cells holding the
+    word's first letter, and only follows directions whose next cell holds
+    the word's second letter.
+    Arguments: grid is a 2D array of one character strings.
+    word is a string of any length.
+    index is a dictionary as returned by make_letter_index.
+    Return value: an array that may be empty or contain tuples of integers.
+    """
+    if word=="":
+        return []
+    height=len(grid)
+    width=max((len(row) for row in grid), default=0)
+    for i, j in index.get(word[0], []):
+        if len(word)==1:
+            return [(i, j)]
+        for y_incr, x_incr in DIRECTIONS:
+            y=i+y_incr*(len(word)-1)  # last letter must be on the grid
+            x=j+x_incr*(len(word)-1)
+            if y<0 or y>=height or x<0 or x>=width:
+                continue
+            k=1  # check each cell, since rows may be short
+            while k<len(word):
+                y=i+k*y_incr
+                x=j+k*x_incr
+                if x>=len(grid[y]) or grid[y][x]!=word[k]:
+                    break
+                k+=1
+            if k==len(word):  # every letter matched
+                return [(i+step*y_incr, j+step*x_incr)
+                        for step in range(len(word))]
+    return []
+
+def find_matches_index(grid, words):
+    """
+    This function finds every word in a 2D array of letters with
+    find_match_indexed, building the letter index once for all the words.
+    Arguments: grid is a 2D array of one character strings.
+    words is an array of strings of any length.
+    Return value: matches is a dictionary mapping each word to an array that
+    may be empty or contain tuples of integers.
+    """
+    index=make_letter_index(grid)
+    matches={}
+    for word in words:
+        matches[word]=find_match_indexed(grid, word, index)
+    return matches
+
+def make_code_grid(grid):
+    """
+    This function turns a 2D array of letters into a NumPy array of their
+    code points. Rows shorter than the widest row are padded with 0, which
+    no letter of a word can match.
+    Argument: grid is a 2D array of one character strings.
+    Return value: a 2D NumPy array of unsigned integers.
+    """
+    width=max((len(row) for row in grid), default=0)
+    codes=np.zeros((len(grid), width), dtype=np.uint32)
+    for i in range(len(grid)):
+        codes[i, :len(grid[i])]=[ord(letter) for letter in grid[i]]
+    return codes
+
+def find_match_numpy(codes, word):
+    """
+    This function determines whether a word is contained within a grid of
+    code points using shifted array comparisons. For each direction, the
+    cells where the word could start are compared against each letter of the
+    word at once, and the cells that match every letter are the matches.
+    Arguments: codes is a 2D NumPy array as returned by make_code_grid.
+    word is a string of any length.
+    Return value: an array that may be empty or contain tuples of integers.
+    """
+    if word=="" or codes.size==0:
+        return []
+    height, width=codes.shape
+    last=len(word)-1
+    best=None  # (i, j, y_incr, x_incr) of the match find_match finds first
+    for y_incr, x_incr in DIRECTIONS:
+        top=max(0, -y_incr*last)  # starts whose last letter is on the grid
+        bottom=height-max(0, y_incr*last)
+        left=max(0, -x_incr*last)
+        right=width-max(0, x_incr*last)
+        if top>=bottom or left>=right:  # word is too long for the grid
+            continue
+        mask=np.ones((bottom-top, right-left), dtype=bool)
+        for k in range(len(word)):
+            shifted=codes[top+k*y_incr:bottom+k*y_incr,
+                          left+k*x_incr:right+k*x_incr]
+            mask&=shifted==ord(word[k])
+        starts=np.flatnonzero(mask)  # in row by row order
+        if starts.size!=0:
+            i, j=divmod(int(starts[0]), right-left)
+            key=(top+i, left+j, y_incr, x_incr)
+            if best is None or key<best:
+                best=key
+    if best is None:
+        return []
+    i, j, y_incr, x_incr=best
+    return [(i+k*y_incr, j+k*x_incr) for k in range(len(word))]
+
+def find_matches_numpy(grid, words):
+    """
+    This function finds every word in a 2D array of letters with
+    find_match_numpy, converting the grid to code points once.
+    Arguments: grid is a 2D array of one character strings.
+    words is an array of strings of any length.
+    Return value: matches is a dictionary mapping each word to an array that
+    may be empty or contain tuples of integers.
+    """
+    codes=make_code_grid(grid)
+    matches={}
+    for word in words:
+        matches[word]=find_match_numpy(codes, word)
+    return matches
+
+def find_matches_scan(grid, words):
+    """
+    This function finds every word in a 2D array of letters by calling
+    find_match for each word.
+    Arguments: grid is a 2D array of one character strings.
+    words is an array of strings of any length.
+    Return value: matches is a dictionary mapping each word to an array that
+    may be empty or contain tuples of integers.
+    """
+    matches={}
+    for word in words:
+        matches[word]=find_match(grid, word)
+    return matches
+
+def render_match(grid, indices):
+    """
+    This function makes the text of a version of the grid
+    where only the letters with the indices in the indices
+    argument have the original values, and everything
+    else is a dot. The indices are grouped by row first,
+    so rows without any of them are just dots.
+    Arguments: grid is a 2D array of one character
+    strings. indices is an iterable of tuples of integers.
+    Return value: a string of the rows, each ending in a newline.
+    """
+    marked={}  # maps row numbers to the columns to show
+    for i, j in indices:
+        if i not in marked:
+            marked[i]=set()
+        marked[i].add(j)
+    rows=[]
+    for i in range(len(grid)):
+        if i not in marked:
+            rows.append("."*len(grid[i]))
+            continue
+        row=["."]*len(grid[i])  # make the display one row at a time
+        for j in marked[i]:
+            row[j]=grid[i][j]
+        rows.append("".join(row))
+    rows.append("")  # so the text ends in a newline
+    return "\n".join(rows)
+
 def show_match(grid, indices):
     """
     This function displays a version of the grid
@@ -114,24 +414,134 @@ def show_match(grid, indices):
     Arguments: grid is a 2D array of one character
     strings. indices is an array of tuples of integers.
     """
-    for i in range(len(grid)): 
-        row=""  # make the display one row at a time
-        for j in range(len(grid[i])):
-            if (i, j) in indices:  # display the grid letter
-                row+=grid[i][j]    # if the grid index is an index
-            else:                  # of the word of interest, and
-                row+="."           # display a dot otherwise
-        print(row)
+    sys.stdout.write(render_match(grid, indices))
+
+def show_all_matches(grid, words, matches):
+    """
+    This function displays every found word on a single
+    grid, in one write, followed by a line for each word
+    that wasn't found.
+    Arguments: grid is a 2D array of one character
+    strings. words is an array of strings. matches is a
+    dictionary mapping each word to an array of tuples of
+    integers.
+    """
+    indices=set()
+    missing=[]
+    for word in words:
+        if matches[word]==[]:
+            missing.append("Word '" + word + "' not found\n")
+        indices.update(matches[word])
+    sys.stdout.write(render_match(grid, indices)+"".join(missing))
+
+def check_mode(mode):
+    """
+    This function ends the program with an error message if a search mode
+    doesn't exist or can't be used.
+    Argument: mode is a string.
+    """
+    if mode not in MODES:
+        print("Sorry, the search mode must be one of: "+", ".join(MODES))
+        sys.exit(0)
+    if mode=="numpy" and np is None:
+        print("Sorry, the numpy search mode needs NumPy to be installed.")
+        sys.exit(0)
+
+def get_mode():
+    """
+    This function gets the search mode from the command line; the default
+    is the automaton search.
+    Return value: mode is a string, a key of MODES.
+    """
+    mode="automaton"
+    args=[arg for arg in sys.argv[1:] if arg!="--combined"]
+    if len(args)>0:
+        mode=args[0]
+    check_mode(mode)
+    return mode
+
+def get_puzzle_files(path):
+    """
+    This function gets the puzzle files to solve in a batch.
+    Argument: path is a string, either a directory (every file in it is
+    used) or a glob pattern.
+    Return value: an array of file name strings, sorted.
+    """
+    if os.path.isdir(path):
+        names=[os.path.join(path, name) for name in os.listdir(path)]
+    else:
+        names=glob.glob(path)
+    return sorted(name for name in names if os.path.isfile(name))
+
+def solve_file(file_name, mode):
+    """
+    This function parses and solves one puzzle file of a batch.
+    Arguments: file_name is a string.
+    mode is a string, a key of MODES.
+    Return value: result is a dictionary with the file name and either the
+    positions of each word (an empty array if it wasn't found) or an error
+    message.
+    """
+    try:
+        with open(file_name, "r") as file:
+            grid, words=make_data(file)
+    except (OSError, UnicodeDecodeError) as error:  # file can't be read
+        return {"file": file_name, "error": str(error)}
+    matches=MODES[mode](grid, words)
+    return {"file": file_name, "words": matches}
+
+def batch_main(args):
+    """
+    This function solves every puzzle file given on the command line across
+    a process pool. One line of JSON is written per puzzle as the results
+    come in, and the throughput is displayed on stderr at the end.
+    Argument: args is an array of strings: a directory or glob pattern,
+    then optionally a search mode and a number of worker processes.
+    """
+    if len(args)==0:
+        print("Sorry, batch mode needs a directory or glob of puzzle files.")
+        sys.exit(0)
+    mode="automaton"
+    if len(args)>1:
+        mode=args[1]
+    check_mode(mode)
+    workers=None  # one process per CPU
+    if len(args)>2:
+        workers=int(args[2])
+    file_names=get_puzzle_files(args[0])
+    start_time=time.perf_counter()
+    with concurrent.futures.ProcessPoolExecutor(workers) as pool:
+        results=pool.map(solve_file, file_names, [mode]*len(file_names),
+                         chunksize=16)
+        for result in results:
+            sys.stdout.write(json.dumps(result)+"\n")
+    seconds=time.perf_counter()-start_time
+    sys.stdout.flush()
+    rate=len(file_names)/seconds if seconds>0 else 0.0
+    print("Solved %d puzzles in %.3fs (%.1f puzzles/sec)" %
+          (len(file_names), seconds, rate), file=sys.stderr)
+
+MODES={"automaton": find_matches_automaton, "index": find_matches_index,
+       "numpy": find_matches_numpy, "scan": find_matches_scan}
 
 def main():
+    if len(sys.argv)>1 and sys.argv[1]=="batch":
+        batch_main(sys.argv[2:])
+        return
+    mode=get_mode()
     file=get_file()
     grid, words=make_data(file)
+    matches=MODES[mode](grid, words)
+    if "--combined" in sys.argv:  # every word on one grid
+        show_all_matches(grid, words, matches)
+        return
     for word in words:
-        indices = find_match(grid, word)
+        indices=matches[word]
         if indices==[]:  # indices will be empty if the word wasn't found
             print("Word '" + word + "' not found")
         else:
             show_match(grid, indices)
         print()
 
-main()
\ No newline at end of file
+if __name__=="__main__":
+    main()